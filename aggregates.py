@@ -0,0 +1,194 @@
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from constants import active_fiscal_year, pathmanager, testing_mode
+from formatting import Formatter
+from logger import Logger
+from rich.console import Console
+from rich.table import Table
+from utils import fsync_file, load_json_ledger
+
+console = Console()
+logger = Logger()
+
+DIMENSIONS: tuple[str, ...] = ("funding_org", "consultant", "mb_division", "type", "value_extent")
+
+
+def _log_serial(log_id: str) -> Optional[tuple[str, int]]:
+    """Splits '{fy}-{category}-{serial}' into (category, serial)."""
+    parts = str(log_id).split("-")
+    if len(parts) != 3 or not parts[2].isdigit():
+        return None
+    return parts[1], int(parts[2])
+
+
+class AwardAggregates:
+    """
+    Running fiscal-year totals of award counts, monetary and time-off amounts
+    by funding org, consultant, MB division, type and value x extent, plus
+    per-employee totals keyed by normalized employee name for the fiscal
+    year cap check. Only totals are kept, so each commit updates the state in
+    O(1). A per-category serial high-water mark keeps a replayed commit from
+    being counted twice.
+    """
+
+    def __init__(self, state_path: Optional[Path] = None):
+        self.state_path = state_path if state_path else pathmanager.aggregates_path
+        self._stale: bool = False
+        self.state: dict = self._load()
+
+    @staticmethod
+    def _empty_state() -> dict:
+        return {
+            "fiscal_year": active_fiscal_year,
+            "applied_serials": {},
+            "totals": {dimension: {} for dimension in DIMENSIONS},
+            "employees": {},
+        }
+
+    def _load(self) -> dict:
+        """
+        Loads the saved totals. A missing, unreadable or out-of-date file is
+        rebuilt from the ledger in memory, and saved by the next commit.
+        """
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as file:
+                state: dict = json.load(file)
+            if state.get("fiscal_year") == active_fiscal_year and "employees" in state:
+                for employee in state["employees"].values():
+                    employee.pop("awards", None)
+                return state
+            reason: str = f"is not for FY{active_fiscal_year}"
+        except FileNotFoundError:
+            reason = "is missing"
+        except (OSError, ValueError) as e:
+            reason = f"could not be read ({e})"
+        logger.warning(f"'{self.state_path.name}' {reason}; rebuilding the totals from the ledger.")
+        self._stale = True
+        return self._scan_ledger()
+
+    def _dump(self, durable: bool = False) -> None:
+        # Readers load the file while commits write it, so it is replaced
+        # whole and never seen half-written.
+        temp_path = self.state_path.with_suffix(f".{os.getpid()}-{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.state, file, indent=4)
+            if durable:
+                fsync_file(temp_path)
+            os.replace(temp_path, self.state_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        self._stale = False
+
+    def is_counted(self, log_id: Optional[str]) -> bool:
+        """Returns True if the award with this log ID is already in the totals."""
+        parsed = _log_serial(log_id)
+        if parsed is None:
+            return False
+        category, serial = parsed
+        return serial <= self.state["applied_serials"].get(category, -1)
+
+    def _apply(self, record: dict[str, str | int | None]) -> bool:
+        """Adds a ledger record to the totals. Returns False if already counted."""
+        parsed = _log_serial(record.get("log_id"))
+        if parsed is None or self.is_counted(record.get("log_id")):
+            return False
+        category, serial = parsed
+        self.state["applied_serials"][category] = serial
+
+        keys: dict[str, str] = {
+            "funding_org": record.get("funding_org"),
+            "consultant": record.get("consultant"),
+            "mb_division": record.get("mb_division"),
+            "type": record.get("type"),
+            "value_extent": f"{record.get('value') or '-'} x {record.get('extent') or '-'}",
+        }
+        for dimension, key in keys.items():
+            totals: dict = self.state["totals"][dimension].setdefault(
+                str(key) if key else "-", {"count": 0, "monetary": 0, "time_off": 0}
+            )
+            totals["count"] += 1
+            totals["monetary"] += int(record.get("monetary_amount") or 0)
+            totals["time_off"] += int(record.get("time_off_amount") or 0)
+
+        employee_key: str = Formatter(record.get("employee_name")).key() or "-"
+        employee: dict = self.state["employees"].setdefault(
+            employee_key, {"monetary": 0, "time_off": 0}
+        )
+        employee["monetary"] += int(record.get("monetary_amount") or 0)
+        employee["time_off"] += int(record.get("time_off_amount") or 0)
+        return True
+
+    def employee_totals(
+        self,
+        employee_name: Optional[str],
+        counted: Optional[dict[str, str | int | None]] = None,
+    ) -> tuple[int, int]:
+        """
+        Returns the employee's committed (monetary, time-off) totals for the
+        fiscal year. When `counted` is a record whose log ID is already in the
+        totals, its amounts are left out so a saved award is not counted twice.
+        """
+        employee: Optional[dict] = self.state["employees"].get(
+            Formatter(employee_name).key() or "-"
+        )
+        if employee is None:
+            return 0, 0
+        monetary_total: int = employee["monetary"]
+        time_off_total: int = employee["time_off"]
+        if counted is not None and self.is_counted(counted.get("log_id")):
+            monetary_total -= int(counted.get("monetary_amount") or 0)
+            time_off_total -= int(counted.get("time_off_amount") or 0)
+        return monetary_total, time_off_total
+
+    def add(self, record: dict[str, str | int | None]) -> None:
+        """Adds one committed award to the totals."""
+        self.add_many([record])
+
+    def add_many(self, records: list[dict[str, str | int | None]], durable: bool = False) -> None:
+        """Adds committed awards to the totals with a single state write."""
+        if testing_mode:
+            return
+        # A rebuilt state is saved even when the ledger already held the records.
+        if any([self._apply(record) for record in records]) or self._stale:
+            self._dump(durable)
+
+    def _scan_ledger(self) -> dict:
+        """Computes the totals from the JSON ledger."""
+        self.state = self._empty_state()
+        records = sorted(
+            (record for record in load_json_ledger() if _log_serial(record.get("log_id"))),
+            key=lambda record: _log_serial(record.get("log_id")),
+        )
+        for record in records:
+            self._apply(record)
+        return self.state
+
+    def rebuild(self) -> None:
+        """Recomputes the totals from the JSON ledger and saves them."""
+        self.state = self._scan_ledger()
+        self._dump()
+        count: int = sum(totals["count"] for totals in self.state["totals"]["type"].values())
+        logger.info(f"Aggregates rebuilt from {count} ledger records.")
+
+    def report(self) -> None:
+        """Prints the fiscal-year totals."""
+        for dimension in DIMENSIONS:
+            table = Table(title=f"FY{active_fiscal_year} Totals by {dimension}")
+            table.add_column(dimension)
+            table.add_column("Awards", justify="right")
+            table.add_column("Monetary", justify="right")
+            table.add_column("Time-Off (hrs)", justify="right")
+            rows: dict[str, dict] = self.state["totals"].get(dimension, {})
+            for key, totals in sorted(rows.items(), key=lambda item: -item[1]["count"]):
+                table.add_row(
+                    key,
+                    str(totals["count"]),
+                    f"${totals['monetary']:,}",
+                    f"{totals['time_off']:,}",
+                )
+            console.print(table)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+from constants import pathmanager, testing_mode
+from formatting import Formatter
+from logger import Logger
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+logger = Logger()
+
+
+def parse_archive_name(pdf_path: Path) -> Optional[tuple[str, str]]:
+    """
+    Returns (log_id, date_received) from an archive file named
+    '{log_id} _ {funding_org} _ {employee_name} _ {date_received}.pdf'.
+    """
+    parts: list[str] = pdf_path.stem.split(" _ ")
+    if len(parts) < 4:
+        return None
+    return parts[0].strip(), parts[-1].strip()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArchiveCatalog:
+    """
+    Local log ID -> archived PDF index, so finding an award's archive file
+    never lists the network share. Entries are appended as JSON lines when
+    a file is archived; the last line for a log ID wins. `rescan` rebuilds
+    the catalog from the archive folder.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, catalog_path: Optional[Path] = None):
+        self.catalog_path = catalog_path if catalog_path else pathmanager.archive_catalog_path
+        self._entries: Optional[dict[str, dict]] = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if self.catalog_path.exists():
+            with open(self.catalog_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry: dict = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._entries[str(entry["log_id"])] = entry
+        return self._entries
+
+    @staticmethod
+    def entry(
+        archive_path: Path,
+        employee_name: Optional[str] = None,
+        funding_org: Optional[str] = None,
+        sha256: Optional[str] = None,
+        archive_name: Optional[str] = None,
+        stored_sha256: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Builds a catalog entry for an archived file. `archive_name` is the
+        readable file name when `archive_path` is a content-addressed blob.
+        `sha256` is the hash of the submitted file and `stored_sha256` the
+        hash of the archived bytes; they differ when the archive compacted
+        the file. Employee and funding org fall back to the file name when
+        not given.
+        """
+        archive_name = archive_name if archive_name else archive_path.name
+        parts: list[str] = Path(archive_name).stem.split(" _ ")
+        if len(parts) < 4:
+            return None
+        stat = archive_path.stat()
+        stored_sha256 = stored_sha256 if stored_sha256 else file_sha256(archive_path)
+        return {
+            "log_id": parts[0].strip(),
+            "employee_name": employee_name if employee_name else parts[2].strip(),
+            "funding_org": funding_org if funding_org else parts[1].strip(),
+            "date_received": parts[-1].strip(),
+            "name": archive_name,
+            "path": str(archive_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256 if sha256 else stored_sha256,
+            "stored_sha256": stored_sha256,
+        }
+
+    def add(self, entry: Optional[dict]) -> None:
+        """Appends an entry for a newly archived file."""
+        if testing_mode or entry is None:
+            return
+        with self._lock:
+            with open(self.catalog_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry) + "\n")
+        if self._entries is not None:
+            self._entries[str(entry["log_id"])] = entry
+
+    def entries(self) -> list[dict]:
+        """Returns every catalog entry."""
+        return list(self._load().values())
+
+    def get(self, log_id: str) -> Optional[dict]:
+        """Returns the catalog entry for a log ID, if any."""
+        return self._load().get(str(log_id))
+
+    def find(self, query: str) -> list[dict]:
+        """
+        Returns entries whose log ID matches `query` exactly, or whose employee
+        name or funding org contains it (case and punctuation ignored).
+        """
+        entries = self._load()
+        if query in entries:
+            return [entries[query]]
+        key: str = Formatter(query).key() or ""
+        if not key:
+            return []
+        return [
+            entry
+            for entry in entries.values()
+            if key in (Formatter(entry.get("employee_name")).key() or "")
+            or key in (Formatter(entry.get("funding_org")).key() or "")
+        ]
+
+    def rescan(self, archive_dir: Optional[Path] = None) -> int:
+        """
+        Rebuilds the catalog from one listing of the archive folder. Files whose
+        path, size and mtime match their existing entry keep its hash instead of
+        being read again. Entries naming an existing blob directly (shares
+        without hard links) are kept, since the blob holds no readable name.
+        """
+        archive_dir = archive_dir if archive_dir else pathmanager.archive_path
+        known: dict[str, dict] = {entry["path"]: entry for entry in self._load().values()}
+        entries: dict[str, dict] = {
+            log_id: entry
+            for log_id, entry in self._load().items()
+            if Path(entry["path"]).parent.parent.name == ".blobs" and Path(entry["path"]).exists()
+        }
+        for pdf_path in sorted(archive_dir.iterdir()):
+            if pdf_path.suffix.lower() != ".pdf" or parse_archive_name(pdf_path) is None:
+                continue
+            stat = pdf_path.stat()
+            previous: Optional[dict] = known.get(str(pdf_path))
+            sha256: Optional[str] = None
+            stored_sha256: Optional[str] = None
+            if previous and (previous["size"], previous["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                sha256 = previous["sha256"]
+                stored_sha256 = previous.get("stored_sha256", sha256)
+            entry = self.entry(pdf_path, sha256=sha256, stored_sha256=stored_sha256)
+            entries[entry["log_id"]] = entry
+
+        temp_path = self.catalog_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for entry in entries.values():
+                file.write(json.dumps(entry) + "\n")
+        with self._lock:
+            temp_path.replace(self.catalog_path)
+        self._entries = entries
+        logger.info(f"Archive catalog rebuilt with {len(entries)} entries.")
+        return len(entries)
+
+    def print_matches(self, query: str) -> list[dict]:
+        matches: list[dict] = self.find(query)
+        table = Table(title=f"Archive matches for '{query}'")
+        for column in ("Log ID", "Employee", "Funding Org", "Received", "Size", "Path"):
+            table.add_column(column)
+        for entry in matches:
+            table.add_row(
+                entry["log_id"],
+                entry["employee_name"],
+                entry["funding_org"],
+                entry["date_received"],
+                str(entry["size"]),
+                entry["path"],
+            )
+        console.print(table)
+        return matches
@@ -0,0 +1,243 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import fitz
+from archive_catalog import file_sha256
+from constants import compact_archive, pathmanager
+from logger import Logger
+from router import form_fields
+
+logger = Logger()
+
+
+def compact_pdf(pdf_bytes: bytes) -> bytes:
+    """
+    Rewrites a PDF with unused objects and incremental-save history dropped
+    and streams, fonts and images deflated. Content streams are left as they
+    are. Returns the original bytes if the result is not smaller or the form
+    field names and values changed, checkbox and radio states included.
+    """
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        fields_before: dict[str, Optional[str]] = form_fields(doc, names=True)
+        compacted: bytes = doc.tobytes(
+            garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=False
+        )
+    if len(compacted) >= len(pdf_bytes):
+        return pdf_bytes
+    with fitz.open(stream=compacted, filetype="pdf") as doc:
+        if form_fields(doc, names=True) != fields_before:
+            logger.warning("Compaction changed the form fields; archiving the original.")
+            return pdf_bytes
+    return compacted
+
+
+class ArchiveStore:
+    """
+    Content-addressed archive storage. Each distinct PDF is stored once as
+    `<archive>/.blobs/<sha[:2]>/<sha>.pdf`; the readable
+    '{log_id} _ {funding_org} _ {employee_name} _ {date_received}.pdf' name
+    is a hard link to the blob. Shares without hard link support fall back
+    to the archive catalog as the name index. A file whose content is
+    already stored costs no copy. With `compact` set, blobs are compacted
+    before the copy; they stay keyed by the submitted file's hash, and the
+    hash of the stored bytes is kept in a `.sha256` file next to the blob
+    and in the catalog.
+    """
+
+    compact: bool = compact_archive
+    # Archive folder -> whether it supports hard links, learned on first link.
+    _links_supported: dict[str, bool] = {}
+
+    def __init__(self, archive_dir: Optional[Path] = None):
+        self.archive_dir = archive_dir if archive_dir else pathmanager.archive_path
+        self.blob_dir = self.archive_dir / ".blobs"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.pdf"
+
+    def _compact(self, source_path: Path, pdf_bytes: bytes) -> bytes:
+        """Returns the compacted bytes, or the original bytes if compaction fails."""
+        start: float = time.perf_counter()
+        try:
+            compacted: bytes = compact_pdf(pdf_bytes)
+        except Exception as e:
+            logger.warning(f"Unable to compact '{source_path.name}', archiving the original: {e}")
+            return pdf_bytes
+        elapsed: float = time.perf_counter() - start
+        saved: int = len(pdf_bytes) - len(compacted)
+        logger.info(
+            f"Compacted '{source_path.name}': {len(pdf_bytes):,} -> {len(compacted):,} bytes "
+            f"({saved:,} saved, {len(pdf_bytes) / max(elapsed, 1e-6) / 1e6:.1f} MB/s)"
+        )
+        return compacted
+
+    @staticmethod
+    def _stored_sha256(blob_path: Path, sha256: str) -> str:
+        """
+        Returns the hash of a stored blob without reading it: compacted blobs
+        keep theirs in a `.sha256` file, others hold the submitted bytes.
+        """
+        try:
+            return blob_path.with_suffix(".sha256").read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return sha256
+
+    def _put_blob(
+        self, sha256: str, source_path: Path, pdf_bytes: Optional[bytes]
+    ) -> tuple[Path, bool, str]:
+        """
+        Stores the content unless present. Blobs are written to a temporary
+        file and renamed into place, so an existing blob is always complete.
+        Returns (blob path, copied, SHA-256 of the stored bytes).
+        """
+        blob_path = self.blob_path(sha256)
+        if blob_path.exists():
+            return blob_path, False, self._stored_sha256(blob_path, sha256)
+
+        stored_sha256: str = sha256
+        if self.compact:
+            pdf_bytes = pdf_bytes if pdf_bytes is not None else source_path.read_bytes()
+            pdf_bytes = self._compact(source_path, pdf_bytes)
+            stored_sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written before the blob, so a stored compacted blob always has one.
+        if stored_sha256 != sha256:
+            blob_path.with_suffix(".sha256").write_text(stored_sha256, encoding="utf-8")
+        temp_path = blob_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        if pdf_bytes is None:
+            shutil.copy2(source_path, temp_path)
+        else:
+            temp_path.write_bytes(pdf_bytes)
+            shutil.copystat(source_path, temp_path)
+        temp_path.replace(blob_path)
+        return blob_path, True, stored_sha256
+
+    def _link(self, blob_path: Path, name_path: Path) -> bool:
+        """
+        Points `name_path` at the blob. Returns False if links are unsupported
+        or the name already holds different content, which is left in place.
+        """
+        share: str = str(self.archive_dir)
+        if self._links_supported.get(share) is False:
+            return False
+        if name_path.exists():
+            if os.path.samefile(name_path, blob_path):
+                return True
+            logger.warning(
+                f"'{name_path.name}' already exists in the archive with different content; "
+                "kept it and recorded the new file by its blob path."
+            )
+            return False
+        try:
+            os.link(blob_path, name_path)
+        except OSError as e:
+            logger.warning(f"Hard links unavailable on archive share, using catalog names: {e}")
+            self._links_supported[share] = False
+            return False
+        self._links_supported[share] = True
+        return True
+
+    def store(
+        self,
+        source_path: Path,
+        archive_name: str,
+        sha256: Optional[str] = None,
+        pdf_bytes: Optional[bytes] = None,
+    ) -> tuple[Path, str]:
+        """
+        Archives `source_path` (or its already-read `pdf_bytes`) under
+        `archive_name`. Returns the path to record in the catalog (the
+        readable name when linked, otherwise the blob) and the SHA-256 of
+        the stored bytes.
+        """
+        sha256 = sha256 if sha256 else file_sha256(source_path)
+        blob_path, copied, stored_sha256 = self._put_blob(sha256, source_path, pdf_bytes)
+        if not copied:
+            logger.info(f"'{archive_name}' matches an archived file; copy skipped.")
+        name_path = self.archive_dir / archive_name
+        return (name_path if self._link(blob_path, name_path) else blob_path), stored_sha256
+
+
+def benchmark_compaction(folder: Path, archive_dir: Optional[Path] = None) -> dict[str, float]:
+    """
+    Compacts every PDF in `folder` in memory and times writing the original
+    and compacted bytes to a scratch file in the archive folder. Nothing is
+    kept. Returns and prints the totals.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    archive_dir = archive_dir if archive_dir else pathmanager.archive_path
+    scratch_path: Path = archive_dir / f".compact-benchmark-{os.getpid()}.tmp"
+    totals: dict[str, float] = {
+        "files": 0,
+        "bytes_in": 0,
+        "bytes_out": 0,
+        "compact_seconds": 0.0,
+        "copy_seconds_original": 0.0,
+        "copy_seconds_compacted": 0.0,
+    }
+
+    def timed_write(data: bytes) -> float:
+        start = time.perf_counter()
+        with open(scratch_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        return time.perf_counter() - start
+
+    try:
+        for pdf_path in sorted(folder.iterdir()):
+            if pdf_path.suffix.lower() != ".pdf":
+                continue
+            pdf_bytes: bytes = pdf_path.read_bytes()
+            start = time.perf_counter()
+            try:
+                compacted: bytes = compact_pdf(pdf_bytes)
+            except Exception as e:
+                logger.warning(f"Unable to compact '{pdf_path.name}': {e}")
+                continue
+            totals["compact_seconds"] += time.perf_counter() - start
+            totals["copy_seconds_original"] += timed_write(pdf_bytes)
+            totals["copy_seconds_compacted"] += timed_write(compacted)
+            totals["files"] += 1
+            totals["bytes_in"] += len(pdf_bytes)
+            totals["bytes_out"] += len(compacted)
+    finally:
+        scratch_path.unlink(missing_ok=True)
+
+    def rate(num_bytes: float, seconds: float) -> str:
+        return f"{num_bytes / seconds / 1e6:.1f} MB/s" if seconds else "-"
+
+    saved: float = totals["bytes_in"] - totals["bytes_out"]
+    table = Table(title="Archive Compaction Benchmark")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Files", f"{totals['files']:,}")
+    table.add_row("Original size", f"{totals['bytes_in']:,} bytes")
+    table.add_row("Compacted size", f"{totals['bytes_out']:,} bytes")
+    table.add_row(
+        "Saved",
+        f"{saved:,.0f} bytes ({saved / totals['bytes_in']:.1%})" if totals["bytes_in"] else "-",
+    )
+    table.add_row("Compaction throughput", rate(totals["bytes_in"], totals["compact_seconds"]))
+    table.add_row("Share write, original", rate(totals["bytes_in"], totals["copy_seconds_original"]))
+    table.add_row(
+        "Share write, compacted", rate(totals["bytes_out"], totals["copy_seconds_compacted"])
+    )
+    table.add_row(
+        "Time per file, original",
+        f"{totals['copy_seconds_original'] / max(totals['files'], 1) * 1000:.1f} ms",
+    )
+    table.add_row(
+        "Time per file, compact + write",
+        f"{(totals['compact_seconds'] + totals['copy_seconds_compacted']) / max(totals['files'], 1) * 1000:.1f} ms",
+    )
+    Console().print(table)
+    return totals
@@ -1,10 +1,17 @@
+import multiprocessing
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+from reference_data import ReferenceSnapshot, load_reference_data
 
 testing_mode: bool = False
 status: str = "ENABLED" if testing_mode is True else "DISABLED"
 monetary_hold: bool = True
-input(f'\n\nTesting mode {status}.\nMonetary hold: {monetary_hold}\nPress "Enter" to continue.\n\n').strip()
+compact_archive: bool = False
+# Worker processes re-import this module; only the main process prompts.
+if multiprocessing.parent_process() is None:
+    input(f'\n\nTesting mode {status}.\nMonetary hold: {monetary_hold}\nPress "Enter" to continue.\n\n').strip()
 
 active_fiscal_year = 2025
 
@@ -24,12 +31,24 @@ if current_fiscal_year != active_fiscal_year:
 _local_dir: Path
 _network_dir: Path
 
-class IndFileType:
-    standard: int = 0
-    nonstandard: int = 1
-
 class PathManager:
     archive_path: Path = _network_dir / ""
+    inbox_path: Path = _local_dir / ""
+    dry_run_report_path: Path = _local_dir / "dry_run_report.json"
+    duplicate_index_path: Path = _local_dir / "duplicate_index.json"
+    justification_store_path: Path = _local_dir / "justifications.bin"
+    justification_index_path: Path = _local_dir / "justifications.idx"
+    profile_dir: Path = _local_dir / "profiles"
+    commit_journal_path: Path = _local_dir / "commit_journal.jsonl"
+    unknown_layouts_path: Path = _local_dir / "unknown_layouts.jsonl"
+    aggregates_path: Path = _local_dir / "aggregates.json"
+    region_templates_path: Path = _local_dir / "region_templates.json"
+    reference_data_path: Path = _local_dir / "reference_data.yaml"
+    replay_report_path: Path = _local_dir / "replay_report.jsonl"
+    archive_catalog_path: Path = _local_dir / "archive_catalog.jsonl"
+    reconcile_report_path: Path = _local_dir / "reconcile_report.jsonl"
+    worker_socket_path: Path = _local_dir / "workers.sock"
+    worker_key_path: Path = _local_dir / "workers.key"
     json_output_path: Path = _local_dir / ""
     logger_path: Path = _local_dir / ""
     manual_entry_path: Path = _local_dir / ""
@@ -51,11 +70,15 @@ class PathManager:
 
 pathmanager = PathManager()
 
+reference_data: ReferenceSnapshot = load_reference_data(PathManager.reference_data_path)
+
 class EvalManager:
-    value_options: tuple[str, ...]
-    extent_options: tuple[str, ...]
-    monetary_matrix: tuple[tuple[int, int, int], ...]
-    time_off_matrix: tuple[tuple[int, int, int], ...]
+    value_options: tuple[str, ...] = reference_data.value_options
+    extent_options: tuple[str, ...] = reference_data.extent_options
+    monetary_matrix: tuple[tuple[int, int, int], ...] = reference_data.monetary_matrix
+    time_off_matrix: tuple[tuple[int, int, int], ...] = reference_data.time_off_matrix
+    limits: dict[tuple[str, str], tuple[int, int]] = reference_data.eval_limits
+    employee_fy_caps: tuple[Optional[int], Optional[int]] = reference_data.employee_fy_caps
 
 
 class Tracker:
@@ -65,8 +88,11 @@ class Tracker:
     grp_coord: str = "C3"
 
 
-division_map: dict[str, list[str]]
+fuzzy_min_confidence: float = 0.3
+fuzzy_review_confidence: float = 0.6
+
+division_map: dict[str, list[str]] = reference_data.division_map
 
-mb_map: dict[str, list[str]]
+mb_map: dict[str, list[str]] = reference_data.mb_map
 
-consultant_map: dict[str, str]
+consultant_map: dict[str, str] = reference_data.consultant_map
@@ -0,0 +1,90 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from constants import pathmanager
+from logger import Logger
+from rich.console import Console
+from rich.table import Table
+from utils import list_ind_pdfs
+from worker_service import WorkerClient
+
+console = Console()
+logger = Logger()
+
+
+def _preflight_file(pdf_path: Path) -> dict[str, object]:
+    """
+    Validates a single PDF without side effects and returns its report entry.
+    """
+    from ind_processor import IndProcessor
+
+    try:
+        record = IndProcessor(pdf_path, dry_run=True).preflight()
+        return {"file": pdf_path.name, "status": "ok", "error": None, "record": record}
+    except Exception as e:
+        return {"file": pdf_path.name, "status": "failed", "error": str(e), "record": None}
+
+
+def _print_summary(results: list[dict[str, object]]) -> None:
+    table = Table(title="Dry Run Summary")
+    table.add_column("File", overflow="fold")
+    table.add_column("Status")
+    table.add_column("Type")
+    table.add_column("Funding Org")
+    table.add_column("Error", overflow="fold")
+
+    for result in results:
+        record: dict = result["record"] or {}
+        status = result["status"]
+        color = "spring_green3" if status == "ok" else "red1"
+        error = str(result["error"]).strip().split("\n")[0] if result["error"] else "-"
+        table.add_row(
+            result["file"],
+            f"[{color}]{status}[/{color}]",
+            str(record.get("type") or "-"),
+            str(record.get("funding_org") or "-"),
+            error[:100],
+        )
+    console.print(table)
+
+    failed_count: int = sum(1 for result in results if result["status"] != "ok")
+    console.print(
+        f"\nFiles checked: {len(results)}\n"
+        f"Would succeed: {len(results) - failed_count}\n"
+        f"Would fail: {failed_count}\n"
+    )
+
+
+def run_dry_run(
+    folder: Path,
+    workers: Optional[int] = None,
+    report_path: Optional[Path] = None,
+    use_service: bool = False,
+) -> list[dict[str, object]]:
+    """
+    Runs extraction and validation across a folder on a worker pool, or on
+    the warm `WorkerService` pool when `use_service` is set and one is
+    running. No log IDs are consumed and nothing is saved, moved or
+    archived. Prints a summary table and writes a JSON report.
+    """
+    pdf_paths: list[Path] = list_ind_pdfs(folder)
+    report_path = report_path if report_path else pathmanager.dry_run_report_path
+
+    client = WorkerClient.connect() if use_service else None
+    if client is not None:
+        with closing(client):
+            results: list[dict[str, object]] = client.map("preflight", pdf_paths)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_preflight_file, pdf_paths))
+
+    _print_summary(results)
+
+    with open(report_path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4, sort_keys=False)
+    logger.info(f"Dry run report saved to '{report_path.name}'")
+
+    return results
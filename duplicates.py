@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from constants import pathmanager, testing_mode
+from formatting import Formatter
+from justification_store import REFERENCE_PREFIX, JustificationStore
+from logger import Logger
+from utils import load_json_ledger, stream_tsv_rows
+
+logger = Logger()
+
+# Column of the justification in `IndProcessor._tsv_row`: the full text in
+# rows saved before the justification store, a reference since.
+TSV_JUSTIFICATION_COLUMN: int = 15
+
+
+def justification_hash(text: Optional[str]) -> str:
+    """
+    Hashes the justification text, ignoring case, punctuation and whitespace.
+    """
+    normalized: str = Formatter(text).key() if text else ""
+    normalized = normalized if normalized else ""
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def award_fingerprint(record: dict[str, str | int | None]) -> str:
+    """
+    Fingerprints an award by normalized employee name, amounts, type and
+    justification hash.
+    """
+    employee_name: str = Formatter(record.get("employee_name")).key() or ""
+    parts: list[str] = [
+        employee_name,
+        str(record.get("monetary_amount") or 0),
+        str(record.get("time_off_amount") or 0),
+        str(record.get("type") or ""),
+        str(record.get("justification_sha256") or ""),
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class DuplicateIndex:
+    """
+    Persistent fingerprint -> log ID index built from the JSON ledger.
+    The index is rebuilt whenever the ledger changes outside of `add`.
+    Lookups never write: a stale index is rebuilt in memory and only saved
+    by the next commit.
+    """
+
+    # Read-only rebuilds per ledger path, reused while the ledger is unchanged.
+    _rebuilt: dict[str, tuple[list[int], dict[str, str]]] = {}
+
+    def __init__(
+        self,
+        index_path: Optional[Path] = None,
+        ledger_path: Optional[Path] = None,
+    ):
+        self.index_path = index_path if index_path else pathmanager.duplicate_index_path
+        self.ledger_path = ledger_path if ledger_path else pathmanager.json_output_path
+        self._fingerprints: Optional[dict[str, str]] = None
+
+    def ledger_signature(self) -> list[int]:
+        """Returns the ledger's [size, mtime_ns], used to detect outside edits."""
+        if not self.ledger_path.exists():
+            return [0, 0]
+        stat = self.ledger_path.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _read(self, signature: list[int]) -> Optional[dict[str, str]]:
+        """Returns the saved fingerprints if they were saved for `signature`."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data: dict = json.load(file)
+            if data.get("ledger_signature") == signature:
+                return data["fingerprints"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _load(self) -> dict[str, str]:
+        if self._fingerprints is not None:
+            return self._fingerprints
+        signature: list[int] = self.ledger_signature()
+        self._fingerprints = self._read(signature)
+        if self._fingerprints is None:
+            cached = self._rebuilt.get(str(self.ledger_path))
+            if cached and cached[0] == signature:
+                self._fingerprints = cached[1]
+            else:
+                self._fingerprints = self._scan_ledger()
+                self._rebuilt[str(self.ledger_path)] = (signature, self._fingerprints)
+        return self._fingerprints
+
+    def _dump(self) -> None:
+        data = {
+            "ledger_signature": self.ledger_signature(),
+            "fingerprints": self._fingerprints,
+        }
+        temp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.index_path)
+
+    @staticmethod
+    def _legacy_justifications(log_ids: set[str]) -> dict[str, str]:
+        """
+        Finds the justification text of rows saved before the justification
+        hash existed: in the justification store, or for older rows in the
+        TSV output, which held the full text.
+        """
+        store = JustificationStore()
+        texts: dict[str, str] = {}
+        for log_id in log_ids:
+            text: Optional[str] = store.get(log_id)
+            if text is not None:
+                texts[log_id] = text
+        remaining: set[str] = log_ids - texts.keys()
+        if remaining:
+            for _, log_id, columns, _ in stream_tsv_rows(pathmanager.tsv_output_path):
+                if log_id not in remaining or len(columns) <= TSV_JUSTIFICATION_COLUMN:
+                    continue
+                text = columns[TSV_JUSTIFICATION_COLUMN]
+                if text.strip() not in ("", "-") and not text.startswith(REFERENCE_PREFIX):
+                    texts[log_id] = text
+        return texts
+
+    def _scan_ledger(self) -> dict[str, str]:
+        """
+        Builds the fingerprints from the ledger. Rows saved before the
+        justification hash existed are hashed from their stored or TSV
+        justification text. Test UUID rows, and old rows whose justification
+        cannot be found, are skipped.
+        """
+        records: list[dict[str, str | int | None]] = [
+            record
+            for record in load_json_ledger(self.ledger_path)
+            if len(str(record.get("log_id"))) != 36
+        ]
+        missing: set[str] = {
+            str(record.get("log_id"))
+            for record in records
+            if not record.get("justification_sha256")
+        }
+        texts: dict[str, str] = self._legacy_justifications(missing) if missing else {}
+        fingerprints: dict[str, str] = {}
+        for record in records:
+            log_id = str(record.get("log_id"))
+            if not record.get("justification_sha256"):
+                if log_id not in texts:
+                    continue
+                record = {**record, "justification_sha256": justification_hash(texts[log_id])}
+            fingerprints[award_fingerprint(record)] = log_id
+        return fingerprints
+
+    def rebuild(self) -> dict[str, str]:
+        """Rebuilds the index from the ledger and saves it."""
+        self._fingerprints = self._scan_ledger()
+        self._dump()
+        logger.info(f"Duplicate index rebuilt with {len(self._fingerprints)} entries.")
+        return self._fingerprints
+
+    def find(self, fingerprint: str) -> Optional[str]:
+        """Returns the log ID already holding the fingerprint, if any."""
+        return self._load().get(fingerprint)
+
+    def add(
+        self, fingerprint: str, log_id: str, ledger_signature: Optional[list[int]] = None
+    ) -> None:
+        """Records a committed award. Call after the ledger has been written."""
+        self.add_many({fingerprint: log_id}, ledger_signature)
+
+    def add_many(
+        self, fingerprints: dict[str, str], ledger_signature: Optional[list[int]] = None
+    ) -> None:
+        """
+        Records several committed awards with a single index write.
+        `ledger_signature` is the ledger's signature from before the awards
+        were written; when the saved index matches it, the index is extended
+        and re-signed instead of being rebuilt.
+        """
+        if testing_mode:
+            return
+        saved: Optional[dict[str, str]] = (
+            self._read(ledger_signature) if ledger_signature is not None else None
+        )
+        if saved is None:
+            saved = self._scan_ledger()
+            logger.info(f"Duplicate index rebuilt with {len(saved)} entries.")
+        self._fingerprints = saved
+        self._fingerprints.update(fingerprints)
+        self._dump()
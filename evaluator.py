@@ -46,11 +46,11 @@ class AwardEvaluator:
         Calculates the monetary and time-off limits based on value and extent.
         """
 
-        val_idx: Optional[int] = EvalManager.value_options.index(self.value)
-        ext_idx: Optional[int] = EvalManager.extent_options.index(self.extent)
-
-        self.monetary_limit: int = EvalManager.monetary_matrix[val_idx][ext_idx]
-        self.time_off_limit: int = EvalManager.time_off_matrix[val_idx][ext_idx]
+        self.monetary_limit: int
+        self.time_off_limit: int
+        self.monetary_limit, self.time_off_limit = EvalManager.limits[
+            (self.value, self.extent)
+        ]
 
     def calculate_percentages(self):
         """
@@ -0,0 +1,149 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import yaml
+from constants import pathmanager
+from formatting import Formatter
+from logger import Logger
+
+logger = Logger()
+
+LAYOUTS_PATH: Path = Path(__file__).with_name("form_layouts.yaml")
+
+FORMATTERS: dict[str, Callable[[Optional[str]], object]] = {
+    "raw": lambda value: value,
+    "name": lambda value: Formatter(value).name(),
+    "pay_plan": lambda value: Formatter(value).pay_plan(),
+    "numerical": lambda value: Formatter(value).numerical(),
+    "justification": lambda value: Formatter(value).justification(),
+}
+
+
+def layout_fingerprint(field_names: Iterable[str]) -> str:
+    """Hashes the sorted set of form field names."""
+    joined: str = "\n".join(sorted(set(str(name) for name in field_names)))
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FormLayout:
+    """
+    A compiled extraction plan for one form layout.
+    * plan: (attribute, pdf_field, formatter) triples applied in order.
+    * constants: attribute values set regardless of the PDF contents.
+    """
+
+    name: str
+    required_fields: frozenset[str]
+    fingerprints: frozenset[str]
+    plan: tuple[tuple[str, str, Callable[[Optional[str]], object]], ...]
+    constants: dict[str, object] = field(default_factory=dict)
+    post_process: Optional[str] = None
+
+    def matches(self, field_names: frozenset[str], fingerprint: str) -> bool:
+        return fingerprint in self.fingerprints or self.required_fields <= field_names
+
+    def apply(self, target: object, pdf_data: dict[str, Optional[str]]) -> None:
+        for attribute, pdf_field, formatter in self.plan:
+            setattr(target, attribute, formatter(pdf_data.get(pdf_field)))
+        for attribute, value in self.constants.items():
+            setattr(target, attribute, value)
+
+
+class LayoutRegistry:
+    """
+    Resolves a PDF's field-name set to a compiled `FormLayout`.
+    Each new fingerprint is matched against the layouts once and cached, so
+    later PDFs with the same fields resolve with a single dict lookup.
+    """
+
+    _instance: Optional["LayoutRegistry"] = None
+
+    def __init__(self, layouts_path: Path = LAYOUTS_PATH):
+        with open(layouts_path, "r", encoding="utf-8") as file:
+            definitions: dict[str, dict] = yaml.safe_load(file)
+        self.layouts: list[FormLayout] = [
+            self._compile(name, definitions) for name in definitions
+        ]
+        self._cache: dict[str, FormLayout] = {}
+
+    @classmethod
+    def get(cls) -> "LayoutRegistry":
+        if cls._instance is None:
+            cls._instance = LayoutRegistry()
+        return cls._instance
+
+    @staticmethod
+    def _merged_fields(name: str, definitions: dict[str, dict]) -> dict[str, list[str]]:
+        definition: dict = definitions[name]
+        parent: Optional[str] = definition.get("extends")
+        fields: dict[str, list[str]] = (
+            LayoutRegistry._merged_fields(parent, definitions) if parent else {}
+        )
+        fields.update(definition.get("fields") or {})
+        return fields
+
+    @staticmethod
+    def _compile(name: str, definitions: dict[str, dict]) -> FormLayout:
+        definition: dict = definitions[name]
+        plan = []
+        for attribute, (pdf_field, formatter_name) in LayoutRegistry._merged_fields(
+            name, definitions
+        ).items():
+            if formatter_name not in FORMATTERS:
+                raise ValueError(
+                    f"Unknown formatter '{formatter_name}' for '{attribute}' in layout '{name}'."
+                )
+            plan.append((attribute, pdf_field, FORMATTERS[formatter_name]))
+        return FormLayout(
+            name=name,
+            required_fields=frozenset(definition.get("required_fields") or []),
+            fingerprints=frozenset(definition.get("fingerprints") or []),
+            plan=tuple(plan),
+            constants=definition.get("constants") or {},
+            post_process=definition.get("post_process"),
+        )
+
+    def resolve(self, field_names: Iterable[str], report: bool = True) -> FormLayout:
+        """
+        Returns the layout for a field-name set. Unknown layouts raise a
+        ValueError and, when `report` is set, are written to the
+        unknown-layouts report.
+        """
+        field_names = frozenset(field_names)
+        fingerprint: str = layout_fingerprint(field_names)
+        layout: Optional[FormLayout] = self._cache.get(fingerprint)
+        if layout is not None:
+            return layout
+
+        for candidate in self.layouts:
+            if candidate.matches(field_names, fingerprint):
+                self._cache[fingerprint] = candidate
+                logger.info(f"Form layout '{candidate.name}' matched fingerprint {fingerprint[:12]}.")
+                return candidate
+
+        if not report:
+            raise ValueError(f"Unknown form layout (fingerprint {fingerprint[:12]}).")
+        self.report_unknown(field_names)
+        raise ValueError(
+            f"Unknown form layout (fingerprint {fingerprint[:12]}). "
+            f"Field names saved to '{pathmanager.unknown_layouts_path.name}'."
+        )
+
+    @staticmethod
+    def report_unknown(field_names: Iterable[str]) -> None:
+        """Appends a field-name set to the unknown-layouts report."""
+        field_names = frozenset(field_names)
+        fingerprint: str = layout_fingerprint(field_names)
+        entry = {
+            "fingerprint": fingerprint,
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "fields": sorted(field_names),
+        }
+        with open(pathmanager.unknown_layouts_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        logger.warning(f"Unknown form layout reported: {fingerprint[:12]}")
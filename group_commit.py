@@ -0,0 +1,241 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+import run_progress
+from aggregates import AwardAggregates
+from constants import pathmanager
+from duplicates import DuplicateIndex, award_fingerprint
+from ind_processor import COMMIT_STEPS, IndProcessor
+from journal import CommitJournal
+from justification_store import JustificationStore
+from logger import Logger
+from utils import LogID, fsync_file, load_json_ledger
+
+logger = Logger()
+
+
+class GroupCommitter:
+    """
+    Collects validated awards and commits them together. Each output file
+    (ledger, aggregates, TSV, justification store, serial file) is written
+    once per group, with at most one fsync per file.
+    * max_awards: int - commit once this many awards are queued.
+    * max_wait_ms: int - commit once the oldest queued award is this old,
+      from a timer even while the next award is still being processed.
+    * durable: bool - fsync each output file after the group is written.
+
+    Every group is journaled, so a crash mid-group is rolled forward by
+    `recover_incomplete_commits` and the outputs never disagree. Awards
+    count as processed only once their group is saved: `committed` holds
+    them, and `failed` holds every member of a group whose commit failed.
+    Members already journaled carry their commit ID, so the run summary
+    reports them as pending recovery rather than failed.
+    """
+
+    def __init__(self, max_awards: int = 25, max_wait_ms: int = 2000, durable: bool = True):
+        self.max_awards = max_awards
+        self.max_wait_ms = max_wait_ms
+        self.durable = durable
+        self.journal = CommitJournal()
+        self._pending: list[IndProcessor] = []
+        self._fingerprints: dict[str, IndProcessor] = {}
+        self._oldest: Optional[float] = None
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self.committed: list[IndProcessor] = []
+        self.failed: list[dict[str, str]] = []
+
+    def add(self, processor: IndProcessor) -> None:
+        """
+        Queues a validated award whose log ID has not been allocated yet.
+        An award matching one already queued is flagged like a duplicate of
+        a saved award.
+        """
+        fingerprint: str = award_fingerprint(processor._record())
+        with self._lock:
+            queued: Optional[IndProcessor] = self._fingerprints.get(fingerprint)
+        if queued is not None:
+            queued_name: str = queued.source_path.name if queued.source_path else "-"
+            processor._prompt_user_action(
+                f"Suspected duplicate of queued award '{queued_name}': same employee, "
+                "amounts, type and justification."
+            )
+        with self._lock:
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._timer = threading.Timer(
+                    self.max_wait_ms / 1000, self._flush_expired, args=(self._oldest,)
+                )
+                self._timer.daemon = True
+                self._timer.start()
+            self._pending.append(processor)
+            self._fingerprints[fingerprint] = processor
+            self.poll()
+
+    def poll(self) -> None:
+        """Commits the queued awards if the size or age limit is reached."""
+        with self._lock:
+            if not self._pending:
+                return
+            age_ms = (time.monotonic() - self._oldest) * 1000
+            if len(self._pending) >= self.max_awards or age_ms >= self.max_wait_ms:
+                self.flush()
+
+    def _flush_expired(self, oldest: float) -> None:
+        """Timer callback: commits the group started at `oldest` if still queued."""
+        with self._lock:
+            if self._oldest == oldest:
+                self.flush()
+
+    def _sync(self, *paths) -> None:
+        if not self.durable:
+            return
+        for path in paths:
+            if path.exists():
+                fsync_file(path)
+
+    def _assign_log_ids(self, group: list[IndProcessor]) -> None:
+        offsets: dict[str, int] = defaultdict(int)
+        for processor in group:
+            processor.assign_log_id(processor.category, offsets[processor.category])
+            offsets[processor.category] += 1
+
+    def _save_ledger(self, group: list[IndProcessor]) -> None:
+        duplicate_index = DuplicateIndex()
+        ledger_signature: list[int] = duplicate_index.ledger_signature()
+        json_dict_list = load_json_ledger()
+        saved_ids: set = {item.get("log_id") for item in json_dict_list}
+        duplicate_ids: list[str] = [
+            processor.log_id for processor in group if processor.log_id in saved_ids
+        ]
+        if duplicate_ids:
+            raise ValueError(
+                f"{duplicate_ids} already saved to '{pathmanager.json_output_path.name}'"
+            )
+        json_dict_list.extend(processor._record() for processor in group)
+        with open(pathmanager.json_output_path, "w", encoding="utf-8") as file:
+            json.dump(json_dict_list, file, indent=4, sort_keys=False)
+        duplicate_index.add_many(
+            {award_fingerprint(processor._record()): processor.log_id for processor in group},
+            ledger_signature,
+        )
+
+    def _save_tsv(self, group: list[IndProcessor]) -> None:
+        with open(pathmanager.tsv_output_path, "a", encoding="utf-8") as file:
+            file.write("".join(processor._tsv_row() + "\n" for processor in group))
+
+    def _save_serials(self, group: list[IndProcessor]) -> None:
+        last_log_ids: dict[str, str] = {}
+        for processor in group:
+            last_log_ids[processor.category] = processor.log_id
+        for category, log_id in last_log_ids.items():
+            LogID(category).advance_past(log_id)
+
+    def _within_caps(self, group: list[IndProcessor]) -> list[IndProcessor]:
+        """
+        Checks the fiscal-year caps again with the earlier awards of the group
+        counted, since each award was validated before they were saved.
+        Awards over a cap are recorded in `failed` and left out of the group.
+        """
+        accepted: list[IndProcessor] = []
+        for processor in group:
+            try:
+                processor._validate_fiscal_year_caps(accepted)
+            except ValueError as e:
+                logger.error(e)
+                name: str = processor.source_path.name if processor.source_path else "-"
+                self.failed.append({"file": name, "error": str(e)[:100]})
+                run_progress.advance(failed=True)
+                continue
+            accepted.append(processor)
+        return accepted
+
+    def flush(self) -> list[str]:
+        """
+        Commits every queued award and returns the committed log IDs. If the
+        group fails, every member is recorded in `failed` with the error.
+        """
+        with self._lock:
+            group, self._pending, self._oldest = self._pending, [], None
+            self._fingerprints = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            group = self._within_caps(group)
+            if not group:
+                return []
+            try:
+                log_ids: list[str] = self._commit(group)
+            except Exception as e:
+                logger.error(
+                    f"Group commit of {len(group)} awards failed: {e}. Awards already "
+                    "journaled are rolled forward before the next log ID is allocated."
+                )
+                for processor in group:
+                    name: str = (
+                        processor.source_path.name if processor.source_path else str(processor.log_id)
+                    )
+                    self.failed.append(
+                        {
+                            "file": name,
+                            "error": f"Group commit failed: {e}"[:100],
+                            **processor.journal_ref(),
+                        }
+                    )
+                    run_progress.advance(failed=True)
+                return []
+            self.committed.extend(group)
+            for _ in group:
+                run_progress.advance()
+            return log_ids
+
+    def _commit(self, group: list[IndProcessor]) -> list[str]:
+        self._assign_log_ids(group)
+        log_ids: list[str] = [processor.log_id for processor in group]
+        commit_ids: list[str] = self.journal.begin_many(
+            [(processor.log_id, processor._journal_state()) for processor in group]
+        )
+        for processor, commit_id in zip(group, commit_ids):
+            processor.commit_id = commit_id
+
+        JustificationStore().put_many(
+            {processor.log_id: processor.justification for processor in group}
+        )
+        self._sync(pathmanager.justification_store_path, pathmanager.justification_index_path)
+        self.journal.mark_many(commit_ids, "justification")
+
+        self._save_ledger(group)
+        self._sync(pathmanager.json_output_path)
+        self.journal.mark_many(commit_ids, "ledger")
+
+        AwardAggregates().add_many(
+            [processor._record() for processor in group], durable=self.durable
+        )
+        self.journal.mark_many(commit_ids, "aggregates")
+
+        self._save_tsv(group)
+        self._sync(pathmanager.tsv_output_path)
+        self.journal.mark_many(commit_ids, "tsv")
+
+        self._save_serials(group)
+        self._sync(pathmanager.serial_path)
+        self.journal.mark_many(commit_ids, "serial")
+
+        done: set[str] = {"justification", "ledger", "aggregates", "tsv", "serial"}
+        for processor in group:
+            processor._run_commit_steps(self.journal, COMMIT_STEPS, done)
+        self.journal.complete_many(commit_ids)
+        for processor in group:
+            processor.commit_id = None
+
+        for processor in group:
+            logger.final(processor)
+        logger.info(f"Group commit saved {len(group)} awards: {log_ids[0]} - {log_ids[-1]}")
+        return log_ids
+
+    def close(self) -> list[str]:
+        """Commits whatever is still queued and stops the timer."""
+        return self.flush()
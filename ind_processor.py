@@ -1,23 +1,32 @@
+import hashlib
 import json
-import shutil
 from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import fitz
+import run_progress
+from aggregates import AwardAggregates
+from archive_catalog import ArchiveCatalog
+from archive_store import ArchiveStore
 from constants import (
     EvalManager,
-    IndFileType,
+    active_fiscal_year,
     consultant_map,
     monetary_hold,
     pathmanager,
     testing_mode,
 )
+from duplicates import DuplicateIndex, award_fingerprint, justification_hash
 from evaluator import AwardEvaluator
+from form_layouts import LayoutRegistry
 from formatting import Formatter
+from journal import CommitJournal
+from justification_store import JustificationStore
 from logger import Logger
+from region_extract import RegionTemplates
 from rich.console import Console
 from utils import (
     LogID,
@@ -30,14 +39,62 @@ from utils import (
 console = Console()
 logger = Logger()
 
+COMMIT_STEPS: tuple[str, ...] = (
+    "justification",
+    "ledger",
+    "aggregates",
+    "tsv",
+    "serial",
+    "archive",
+)
+
+
+def extract_pdf_fields(pdf_bytes: bytes) -> dict[str, Optional[str]]:
+    """
+    Extracts form field names and values from an in-memory PDF, falling back
+    to the region templates when the form has been flattened.
+    Module-level so it can run in a process pool.
+    """
+    import warnings
+
+    warnings.filterwarnings("ignore", module="pymupdf")
+
+    pdf_data = {}
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        if doc.page_count > 2:
+            raise ValueError("IndProcessor is unable to process GRP awards.")
+        for page in doc:
+            for field in page.widgets():
+                key = Formatter(field.field_name).key()
+                val = Formatter(field.field_value).value()
+                pdf_data[key] = val
+
+        if not pdf_data:
+            pdf_data = RegionTemplates.get().extract(doc)
+
+    warnings.resetwarnings()
+    if not pdf_data:
+        raise ValueError("No data extracted from the PDF.")
+
+    return pdf_data
+
 
 @dataclass
 class BaseProcessor:
     source_path: Optional[Path | str] = None
+    dry_run: bool = False
+    defer_log_id: bool = False
+    # `ServiceExtractor` set by main with --use-service.
+    service = None
 
     def __post_init__(self):
         self.handle_source_path()
+        self.pdf_bytes: Optional[bytes] = None
+        self._sha256: Optional[str] = None
         self.log_id: Optional[str] = None
+        self.commit_id: Optional[str] = None
+        self._confirmed_duplicate: Optional[str] = None
         self.funding_org: Optional[str] = None
         self.nominator_name: Optional[str] = None
         self.nominator_org: Optional[str] = None
@@ -56,6 +113,7 @@ class BaseProcessor:
         self.type: Optional[str] = None
         self.date_received = datetime.now().strftime("%Y-%m-%d")
         self.consultant: Optional[str] = None
+        self.form_layout: Optional[str] = None
 
     def handle_source_path(self) -> None:
         """Validates and processes the source path."""
@@ -80,29 +138,31 @@ class BaseProcessor:
             )
         if not self.source_path.is_file() or not self.source_path.exists():
             raise ValueError(f"Source path is not a file or does not exist.")
-        logger.path(self.source_path.name)
-
-    def extract_pdf_data(self) -> dict[str, Optional[str]]:
-        import warnings
+        if not self.dry_run:
+            logger.path(self.source_path.name)
 
-        warnings.filterwarnings("ignore", module="pymupdf")
-
-        pdf_data = {}
+    def read_pdf_bytes(self) -> bytes:
+        """
+        Reads the source PDF into memory once. The buffer is reused for
+        hashing, parsing and writing the archive copy.
+        """
+        if self.pdf_bytes is None:
+            self.pdf_bytes = self.source_path.read_bytes()
+        return self.pdf_bytes
 
-        with fitz.open(self.source_path) as doc:
-            if doc.page_count > 2:
-                raise ValueError("IndProcessor is unable to process GRP awards.")
-            for page in doc:
-                for field in page.widgets():
-                    key = Formatter(field.field_name).key()
-                    val = Formatter(field.field_value).value()
-                    pdf_data[key] = val
+    @property
+    def sha256(self) -> str:
+        """SHA-256 hex digest of the source PDF, computed from the shared buffer."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.read_pdf_bytes()).hexdigest()
+        return self._sha256
 
-        if not pdf_data:
-            raise ValueError("No data extracted from the PDF.")
+    def extract_pdf_data(self) -> dict[str, Optional[str]]:
+        """Extracts on the worker service when one is set, otherwise in-process."""
+        pdf_data = self.service.extract(self.read_pdf_bytes()) if self.service else None
+        if pdf_data is None:
+            pdf_data = extract_pdf_fields(self.read_pdf_bytes())
         logger.info("Extracted data from PDF.")
-        warnings.resetwarnings()
-        
         return pdf_data
 
 
@@ -143,105 +203,38 @@ class IndProcessor(BaseProcessor):
     def populate_attributes(self, pdf_data: dict[str, Optional[str]]):
         """Populates attributes from PDF data."""
         category = "IND"
-        self.log_id = LogID(category).get()
-        validate_log_id(self.log_id)
-        self.employee_name = Formatter(pdf_data.get("employee_name")).name()
-        self.employee_org = pdf_data.get("organization")
-        self.certifier_name = Formatter(
-            pdf_data.get("special_act_award_funding_string_2")
-        ).name()
-        self.certifier_org = pdf_data.get("org_2")
-        self.approver_name = Formatter(pdf_data.get("please_print_3")).name()
-        self.approver_org = pdf_data.get("org_4")
-        self.administrator_name = Formatter(pdf_data.get("please_print_4")).name()
-        self.funding_string = pdf_data.get("special_act_award_funding_string_1")
+        if not self.dry_run and not self.defer_log_id:
+            self.assign_log_id(category)
         self.set_value_and_extent(pdf_data)
-        self.handle_nonstandard_pdf(pdf_data)
-        self.handle_external_pdf(pdf_data)
+        self.apply_form_layout(pdf_data)
         self.category = category
         self.date_received = datetime.now().strftime("%Y-%m-%d")
 
         logger.info("Populated attributes from PDF data.")
 
-    def handle_nonstandard_pdf(self, pdf_data: dict[str, Optional[str]]) -> None:
-        """Normalizes non-standard PDF data."""
-
-        
-        idx: int = IndFileType.standard
-        if "a_nominees_team_leadersupervisor_1" in pdf_data.keys():
-            idx = IndFileType.nonstandard
-
-        employee_pay_plan = ("pay_plan_gradestep_1", "pay_plan_gradestep")
-        sas_monetary_amount = ("undefined", "amount")
-        sas_time_off_amount = ("hours_2", "hours")
-        ots_monetary_amount = ("on_the_spot_award", "amount_2")
-        ots_time_off_amount = ("hours", "hours_2")
-        nominator_name = ("please_print", "nominators_name")
-        nominator_org = ("org", "organization_2")
-        employee_supervisor_name = (
-            "please_print_2",
-            "a_nominees_team_leadersupervisor_1",
-        )
-        employee_supervisor_org = ("org_3", "organization_3")
-        approver_name = ("please_print_3", "approving_officialdesignee_1")
-        approver_org = ("org_4", "organization_5")
-        reviewer_name = ("please_print_5", "compliance_review_completed_by_1")
-        justification = (
-            "extent_of_application",
-            "extent_of_application_limited_extended_or_general",
-        )
-
-        self.employee_pay_plan = Formatter(
-            pdf_data.get(employee_pay_plan[idx])
-        ).pay_plan()
-        self.sas_monetary_amount = Formatter(
-            pdf_data.get(sas_monetary_amount[idx])
-        ).numerical()
-        self.sas_time_off_amount = Formatter(
-            pdf_data.get(sas_time_off_amount[idx])
-        ).numerical()
-        self.ots_monetary_amount = Formatter(
-            pdf_data.get(ots_monetary_amount[idx])
-        ).numerical()
-        self.ots_time_off_amount = Formatter(
-            pdf_data.get(ots_time_off_amount[idx])
-        ).numerical()
-        self.nominator_name = Formatter(pdf_data.get(nominator_name[idx])).name()
-
-        self.nominator_org = pdf_data.get(nominator_org[idx])
-
-        self.employee_supervisor_name = Formatter(
-            pdf_data.get(employee_supervisor_name[idx])
-        ).name()
-
-        self.employee_supervisor_org = pdf_data.get(employee_supervisor_org[idx])
-
-        self.approver_name = Formatter(pdf_data.get(approver_name[idx])).name()
-
-        self.approver_org = pdf_data.get(approver_org[idx])
-
-        self.reviewer_name = Formatter(pdf_data.get(reviewer_name[idx])).name()
-        self.justification = Formatter(pdf_data.get(justification[idx])).justification()
-
-        logger.info("Normalized non-standard PDF data.")
+    def assign_log_id(self, category: str = "IND", offset: int = 0) -> None:
+        """
+        Allocates the next log ID for the category. A journaled commit that
+        failed before advancing the serial is settled first, so its ID is
+        never handed out again.
+        """
+        if offset == 0:
+            settle_unserialized_commits()
+        self.log_id = LogID(category).get(offset)
+        validate_log_id(self.log_id)
 
-    def handle_external_pdf(self, pdf_data: dict[str, Optional[str]]) -> None:
-        """Normalizes PDF data from external agencies."""
-        
-        if "employee's_name" not in pdf_data:
-            return
+    def apply_form_layout(self, pdf_data: dict[str, Optional[str]]) -> None:
+        """Populates attributes using the compiled plan for the PDF's form layout."""
+        layout = LayoutRegistry.get().resolve(pdf_data.keys(), report=not self.dry_run)
+        layout.apply(self, pdf_data)
+        if layout.post_process == "external":
+            self._apply_external_rules(pdf_data)
+        self.form_layout = layout.name
 
-        self.employee_name = Formatter(pdf_data.get("employee's_name")).name()
-        self.employee_pay_plan = Formatter(
-            pdf_data.get("position_title_series_and_grade")
-        ).pay_plan()
-        self.sas_monetary_amount = Formatter(
-            pdf_data.get("special_act_amount_first_page")
-        ).numerical()
-        self.ots_monetary_amount = Formatter(
-            pdf_data.get("on_the_spot_amount_first_page")
-        ).numerical()
+        logger.info(f"Normalized PDF data using the '{layout.name}' form layout.")
 
+    def _apply_external_rules(self, pdf_data: dict[str, Optional[str]]) -> None:
+        """Applies the conditional rules for PDFs from external agencies."""
         time_off_field = pdf_data.get("hours_first_page")
         if (
             str(pdf_data.get("on-the-spot_award_checkbox")).lower() == "yes"
@@ -260,13 +253,6 @@ class IndProcessor(BaseProcessor):
         )
 
         self.justification = Formatter(justification_text).justification()
-        self.funding_org = "-"
-        self.nominator_name = "-"
-        self.employee_supervisor_name = "-"
-        self.approver_name = "-"
-        self.reviewer_name = "-"
-
-        logger.info("Normalized PDF data from an external organization.")
 
     def set_value_and_extent(self, pdf_data: dict[str, Optional[str]]) -> None:
         """Sets value and extent attributes based on PDF data options."""
@@ -310,22 +296,24 @@ class IndProcessor(BaseProcessor):
         return [k for k, v in required_fields.items() if v is None]
 
     def _prompt_user_action(self, error_msg: str):
-        logger.warning(error_msg)
-
+        if self.dry_run:
+            raise ValueError(error_msg)
         options = {1: "Continue", 9: "Skip"}
-        while True:
-            try:
-                logger.warning(
-                    "Make a selection:\n"
-                    "1: Continue processing.\n"
-                    "9: Skip this award."
-                )
-                selection: int = int(input("> ").strip())
-                if selection not in options:
-                    raise ValueError("Selection must be 1 or 9.")
-                break
-            except Exception as e:
-                logger.error(f"Invalid selection. {e}")
+        with logger.prompting(), run_progress.paused():
+            logger.prompt(error_msg)
+            while True:
+                try:
+                    logger.prompt(
+                        "Make a selection:\n"
+                        "1: Continue processing.\n"
+                        "9: Skip this award."
+                    )
+                    selection: int = int(input("> ").strip())
+                    if selection not in options:
+                        raise ValueError("Selection must be 1 or 9.")
+                    break
+                except Exception as e:
+                    logger.error(f"Invalid selection. {e}")
         if selection == 9:
             raise ValueError(f"Unable to proceed with processing. {error_msg}")
 
@@ -496,15 +484,65 @@ class IndProcessor(BaseProcessor):
         except SyntaxError as se:
             logger.warning(se)
 
+    def _validate_fiscal_year_caps(self, queued: Optional[list["IndProcessor"]] = None) -> None:
+        """
+        Confirms the award keeps the employee within the fiscal-year caps,
+        using the running per-employee totals instead of scanning the ledger.
+        `queued` holds awards committed together with this one that are not
+        in the totals yet.
+        """
+        monetary_cap, time_off_cap = EvalManager.employee_fy_caps
+        if monetary_cap is None and time_off_cap is None:
+            return
+        monetary_total, time_off_total = AwardAggregates().employee_totals(
+            self.employee_name, self._record()
+        )
+        monetary_total += self.monetary_amount
+        time_off_total += self.time_off_amount
+        employee_key: Optional[str] = Formatter(self.employee_name).key()
+        for processor in queued or []:
+            if Formatter(processor.employee_name).key() == employee_key:
+                monetary_total += processor.monetary_amount
+                time_off_total += processor.time_off_amount
+        if any(
+            [
+                monetary_cap is not None and monetary_total > monetary_cap,
+                time_off_cap is not None and time_off_total > time_off_cap,
+            ]
+        ):
+            raise ValueError(
+                f"Award exceeds the FY{active_fiscal_year} cap for '{self.employee_name}'.\n"
+                f"Monetary: {monetary_total} (cap {monetary_cap})\n"
+                f"Time-Off: {time_off_total} (cap {time_off_cap})"
+            )
+
+    def _check_duplicate(self) -> None:
+        """
+        Flags a suspected resubmission before a log ID is consumed. A match
+        the user already chose to continue past is not asked about again.
+        """
+        duplicate_log_id: Optional[str] = DuplicateIndex().find(
+            award_fingerprint(self._record())
+        )
+        if duplicate_log_id and duplicate_log_id not in (self.log_id, self._confirmed_duplicate):
+            self._prompt_user_action(
+                f"Suspected duplicate of award {duplicate_log_id}: same employee, "
+                "amounts, type and justification."
+            )
+            self._confirmed_duplicate = duplicate_log_id
+        logger.info("Checked for duplicate awards.")
+
     def _validate_and_transform(self) -> None:
         self._validate_fields()
         self._parse_org_divs()
         self._classify_amounts()
         self._validate_amounts()
+        self._validate_fiscal_year_caps()
+        self._check_duplicate()
 
-    def _save_json(self) -> None:
+    def _record(self) -> dict[str, str | int | None]:
         """
-        Saves all award data to a JSON file.
+        Returns the award data as a JSON-serializable dictionary.
         """
         attributes: dict[str, str | int | None] = {
             "source_path": self.source_path.name if self.source_path else None,
@@ -528,12 +566,30 @@ class IndProcessor(BaseProcessor):
             "administrator_name": self.administrator_name,
             "value": self.value,
             "extent": self.extent,
-            "justification": f"{len(self.justification.split(' '))} words",
+            "justification": JustificationStore.reference(self.log_id),
+            "justification_words": len(self.justification.split(" ")),
+            "justification_sha256": justification_hash(self.justification),
             "category": self.category,
             "type": self.type,
             "date_received": self.date_received,
             "consultant": self.consultant,
+            "mb_division": self.mb_division,
         }
+        for k, v in attributes.items():
+            if v is None or type(v) in [str, int, float]:
+                pass
+            else:
+                v = str(v)
+            attributes[k] = v
+        return attributes
+
+    def _save_json(self, resuming: bool = False) -> None:
+        """
+        Saves all award data to a JSON file. A log ID already in the ledger
+        raises ValueError, unless resuming a commit that saved it before the
+        interruption.
+        """
+        attributes: dict[str, str | int | None] = self._record()
 
         with open(pathmanager.json_output_path, "r", encoding="utf-8") as file:
             content: str = file.read().strip()
@@ -541,12 +597,12 @@ class IndProcessor(BaseProcessor):
 
             json_dict_list: list[dict[str, str | int | None]] = json.loads(content)
 
-        for k, v in attributes.items():
-            if v is None or type(v) in [str, int, float]:
-                pass
-            else:
-                v = str(v)
-            attributes[k] = v
+        if any(item.get("log_id") == self.log_id for item in json_dict_list):
+            if resuming:
+                return
+            raise ValueError(
+                f"'{self.log_id}' is already saved to '{pathmanager.json_output_path.name}'"
+            )
 
         json_dict_list.append(attributes)
 
@@ -555,8 +611,8 @@ class IndProcessor(BaseProcessor):
 
         logger.info(f"'{pathmanager.json_output_path.name}' updated with new data")
 
-    def _save_tsv(self) -> None:
-        """Saves data in TSV format to a file."""
+    def _tsv_row(self) -> str:
+        """Formats the award as a single TSV row."""
         self.mb_division = self.mb_division if self.mb_division else ""
         date_processed = ""
         grp_name = ""
@@ -576,7 +632,7 @@ class IndProcessor(BaseProcessor):
             self.nominator_name,
             self.funding_org,
             self.mb_division,
-            self.justification,
+            JustificationStore.reference(self.log_id),
             self.value,
             self.extent,
         ]
@@ -586,88 +642,338 @@ class IndProcessor(BaseProcessor):
             else:
                 tsv_items[idx] = str(item)
 
-        tsv_string = "\t".join(tsv_items)
+        return "\t".join(tsv_items)
+
+    def _save_tsv(self) -> None:
+        """Saves data in TSV format to a file."""
+        tsv_string = self._tsv_row()
 
         with open(pathmanager.tsv_output_path, "a", encoding="utf-8") as file:
             file.write(tsv_string + "\n")
 
         logger.info(f"'{pathmanager.tsv_output_path.name}' updated with new data")
 
-    def _rename_and_copy_file(self) -> None:
-        """Renames and copies a file to an archive path."""
-        if testing_mode or not isinstance(self.source_path, Path):
-            return
+    def _archive_file_stem(self) -> str:
         stem_items: list = [
             self.log_id,
             self.funding_org,
             self.employee_name,
             self.date_received,
         ]
-        file_stem: str = " _ ".join(str(i) for i in stem_items)
+        return " _ ".join(str(i) for i in stem_items)
+
+    def _rename_and_copy_file(self) -> None:
+        """
+        Renames the file and stores it in the content-addressed archive,
+        skipping the copy when identical content is already archived.
+        """
+        if testing_mode or not isinstance(self.source_path, Path):
+            return
+        file_stem: str = self._archive_file_stem()
         new_path: Path = self.source_path.with_stem(file_stem)
         renamed_path: Path = Path(self.source_path.rename(new_path))
-        target_path: Path = pathmanager.archive_path / renamed_path.name
         try:
-            shutil.copy2(renamed_path, target_path)
+            archived_path, stored_sha256 = ArchiveStore().store(
+                renamed_path,
+                renamed_path.name,
+                self.sha256 if self.pdf_bytes is not None else None,
+                self.pdf_bytes,
+            )
         except PermissionError:
             raise PermissionError(
                 "Permission denied. The file is still open in another application. Please close the file and try again."
             )
         except Exception as e:
-            logger.error(f"Error renaming and copying file: {e}")
+            logger.error(
+                f"Error copying '{renamed_path.name}' to the archive; the file was kept "
+                f"and the archive step will be retried on the next run: {e}"
+            )
+            raise
+        renamed_path.unlink()
+        self._catalog_archive(archived_path, renamed_path.name, stored_sha256)
+        logger.info(f"File renamed and copied to '{pathmanager.archive_path.name}'")
+
+    def _catalog_archive(
+        self, archived_path: Path, archive_name: str, stored_sha256: Optional[str] = None
+    ) -> None:
+        """Records the archived file in the local archive catalog."""
+        if not archived_path.exists():
+            return
+        sha256: Optional[str] = self.sha256 if self.pdf_bytes is not None else None
+        ArchiveCatalog().add(
+            ArchiveCatalog.entry(
+                archived_path,
+                self.employee_name,
+                self.funding_org,
+                sha256,
+                archive_name,
+                stored_sha256,
+            )
+        )
+
+    def _resume_archive(self) -> None:
+        """Finishes an archive step interrupted after the local rename."""
+        if testing_mode or not isinstance(self.source_path, Path):
+            return
+        if self.source_path.exists():
+            self._rename_and_copy_file()
+            return
+        renamed_path: Path = self.source_path.with_stem(self._archive_file_stem())
+        if not renamed_path.exists():
+            return
+        archived_path, stored_sha256 = ArchiveStore().store(renamed_path, renamed_path.name)
         renamed_path.unlink()
+        self._catalog_archive(archived_path, renamed_path.name, stored_sha256)
         logger.info(f"File renamed and copied to '{pathmanager.archive_path.name}'")
 
+    def _save_ledger(self, resuming: bool = False) -> None:
+        """Saves the award to the JSON ledger and the duplicate index."""
+        duplicate_index = DuplicateIndex()
+        ledger_signature: list[int] = duplicate_index.ledger_signature()
+        self._save_json(resuming)
+        duplicate_index.add(award_fingerprint(self._record()), self.log_id, ledger_signature)
+
+    def _resume_tsv(self) -> None:
+        """Saves the TSV row unless it was written before the interruption."""
+        if pathmanager.tsv_output_path.exists():
+            with open(pathmanager.tsv_output_path, "r", encoding="utf-8") as file:
+                if any(line.startswith(f"{self.log_id}\t") for line in file):
+                    return
+        self._save_tsv()
+
+    def _commit_steps(self, resuming: bool = False) -> dict[str, Callable[[], None]]:
+        """Maps each journaled commit step to the method that performs it."""
+        return {
+            "justification": lambda: JustificationStore().put(
+                self.log_id, self.justification
+            ),
+            "ledger": lambda: self._save_ledger(resuming),
+            "aggregates": lambda: AwardAggregates().add(self._record()),
+            "tsv": self._resume_tsv if resuming else self._save_tsv,
+            "archive": self._resume_archive if resuming else self._rename_and_copy_file,
+            "serial": lambda: LogID(self.category).advance_past(self.log_id),
+        }
+
+    def _run_commit_steps(
+        self,
+        journal: CommitJournal,
+        steps: tuple[str, ...] = COMMIT_STEPS,
+        done: frozenset[str] | set[str] = frozenset(),
+        resuming: bool = False,
+    ) -> None:
+        """Runs each commit step not yet done, journaling it once it finishes."""
+        step_funcs = self._commit_steps(resuming)
+        for step in steps:
+            if step in done:
+                continue
+            step_funcs[step]()
+            journal.mark(self.commit_id, step)
+
+    def _journal_state(self) -> dict[str, str | int | float | bool | None]:
+        """Returns the attributes needed to redo the commit after a crash."""
+        state = {
+            k: v
+            for k, v in vars(self).items()
+            if k not in ("pdf_bytes", "_sha256", "commit_id", "_confirmed_duplicate")
+            and (v is None or isinstance(v, (str, int, float, bool)))
+        }
+        state["source_path"] = str(self.source_path) if self.source_path else None
+        return state
+
+    @classmethod
+    def from_journal_state(cls, state: dict) -> "IndProcessor":
+        """Rebuilds a processor from a journaled commit."""
+        processor = cls()
+        for k, v in state.items():
+            setattr(processor, k, v)
+        processor.source_path = Path(state["source_path"]) if state.get("source_path") else None
+        return processor
+
+    def resume_commit(self, journal: CommitJournal, commit_id: str, done: set[str]) -> None:
+        """Rolls an interrupted commit forward from its last finished step."""
+        self.commit_id = commit_id
+        self._run_commit_steps(journal, done=done, resuming=True)
+        journal.complete(commit_id)
+        logger.info(f"Recovered interrupted commit for '{self.log_id}'.")
+
     def _save_and_log(self) -> None:
         """Save data in different formats and log the category."""
-        self._save_json()
-        self._save_tsv()
-        self._rename_and_copy_file()
-        LogID(self.category).save()
+        journal = CommitJournal()
+        self.commit_id = journal.begin(self.log_id, self._journal_state())
+        self._run_commit_steps(journal)
+        journal.complete(self.commit_id)
+        self.commit_id = None
+
+    def journal_ref(self) -> dict[str, str]:
+        """
+        Returns the ID of the award's unfinished journaled commit, for a
+        failure entry, so the run summary can report the award as recovered
+        or pending recovery instead of failed. Empty when nothing was saved.
+        """
+        return {"commit_id": self.commit_id} if self.commit_id else {}
 
-    def process_pdf_data(self) -> None:
+    def process_pdf_data(self, committer=None) -> None:
+        """
+        Extracts, validates and saves the award. When a `GroupCommitter` is
+        given, the award is queued for the next group commit instead.
+        """
         if self.source_path:
             pdf_data: dict[str, Optional[str]] = self.extract_pdf_data()
             self.populate_attributes(pdf_data)
         self._validate_and_transform()
+        if committer is not None:
+            committer.add(self)
+            return
         self._save_and_log()
 
         logger.info("PDF processing and data transformation complete.")
         logger.final(self)
 
+    def preflight(
+        self, log_id: Optional[str] = None, date_received: Optional[str] = None
+    ) -> dict[str, str | int | None]:
+        """
+        Runs extraction, validation and transformation without saving, archiving
+        or consuming a log ID. Returns the record that would have been saved.
+        `log_id` and `date_received` reuse an existing award's values on replay.
+        """
+        self.dry_run = True
+        if self.source_path:
+            pdf_data: dict[str, Optional[str]] = self.extract_pdf_data()
+            self.populate_attributes(pdf_data)
+        self.log_id = log_id if log_id else self.log_id
+        self.date_received = date_received if date_received else self.date_received
+        self._validate_and_transform()
+        return self._record()
+
+    def load_manual_entry(self, manual_entry_data: dict[str, str]) -> None:
+        """Populates attributes from a manual entry record."""
+        self.employee_name = manual_entry_data.get("employee_name")
+        self.employee_pay_plan = manual_entry_data.get("employee_pay_plan")
+        self.employee_org = manual_entry_data.get("employee_org")
+        self.sas_monetary_amount = Formatter(
+            manual_entry_data.get("sas_monetary_amount")
+        ).numerical()
+        self.sas_time_off_amount = Formatter(
+            manual_entry_data.get("sas_time_off_amount")
+        ).numerical()
+        self.ots_monetary_amount = Formatter(
+            manual_entry_data.get("ots_monetary_amount")
+        ).numerical()
+        self.ots_time_off_amount = Formatter(
+            manual_entry_data.get("ots_time_off_amount")
+        ).numerical()
+        self.nominator_name = manual_entry_data.get("nominator_name")
+        self.nominator_org = manual_entry_data.get("nominator_org")
+        self.funding_string = manual_entry_data.get("funding_string")
+        self.certifier_name = manual_entry_data.get("certifier_name")
+        self.certifier_org = manual_entry_data.get("certifier_org")
+        self.employee_supervisor_name = manual_entry_data.get(
+            "employee_supervisor_name"
+        )
+        self.employee_supervisor_org = manual_entry_data.get(
+            "employee_supervisor_org"
+        )
+        self.approver_name = manual_entry_data.get("approver_name")
+        self.approver_org = manual_entry_data.get("approver_org")
+        self.administrator_name = manual_entry_data.get("administrator_name")
+        self.reviewer_name = manual_entry_data.get("reviewer_name")
+        self.value = manual_entry_data.get("value")
+        self.extent = manual_entry_data.get("extent")
+        self.justification = manual_entry_data.get("justification")
+        self.category = "IND"
+        if not self.dry_run and not self.defer_log_id:
+            self.assign_log_id(self.category)
+        logger.info("Loaded manual entry data.")
+
     def process_manual_entry(self) -> None:
         """Loads and processes manual entry data."""
         print("\n", " Manual Entry Mode ".center(100, "-"), "\n")
 
         try:
             manual_entry_data: dict[str, str] = ManualEntry.load()
-            self.employee_name = manual_entry_data.get("employee_name")
-            self.employee_pay_plan = manual_entry_data.get("employee_pay_plan")
-            self.employee_org = manual_entry_data.get("employee_org")
-            self.sas_monetary_amount = manual_entry_data.get("sas_monetary_amount")
-            self.sas_time_off_amount = manual_entry_data.get("sas_time_off_amount")
-            self.ots_monetary_amount = manual_entry_data.get("ots_monetary_amount")
-            self.ots_time_off_amount = manual_entry_data.get("ots_time_off_amount")
-            self.nominator_name = manual_entry_data.get("nominator_name")
-            self.nominator_org = manual_entry_data.get("nominator_org")
-            self.funding_string = manual_entry_data.get("funding_string")
-            self.certifier_name = manual_entry_data.get("certifier_name")
-            self.certifier_org = manual_entry_data.get("certifier_org")
-            self.employee_supervisor_name = manual_entry_data.get(
-                "employee_supervisor_name"
-            )
-            self.employee_supervisor_org = manual_entry_data.get(
-                "employee_supervisor_org"
-            )
-            self.approver_name = manual_entry_data.get("approver_name")
-            self.approver_org = manual_entry_data.get("approver_org")
-            self.administrator_name = manual_entry_data.get("administrator_name")
-            self.reviewer_name = manual_entry_data.get("reviewer_name")
-            self.value = manual_entry_data.get("value")
-            self.extent = manual_entry_data.get("extent")
-            self.justification = manual_entry_data.get("justification")
-            logger.info("Loaded manual entry data.")
+            self.load_manual_entry(manual_entry_data)
             self.process_pdf_data()
 
         except Exception as e:
             logger.error(e)
+
+
+def process_manual_batch(path: Optional[Path] = None) -> tuple[list[str], list[dict[str, str]]]:
+    """
+    Runs every record in a multi-record manual entry file through the
+    validate/transform/commit path in one process. Each record is removed
+    from the file as soon as it is committed, so a crash or interruption
+    never commits it twice; failed records stay for correction.
+    """
+    print("\n", " Manual Entry Batch Mode ".center(100, "-"), "\n")
+
+    processed_list: list[str] = []
+    failed_list: list[dict[str, str]] = []
+    removed: int = 0
+    # Read up front so the file can be rewritten after each commit.
+    records: list[dict[str, str]] = list(ManualEntry.iter_records(path))
+    run_progress.set_total(len(records))
+
+    for idx, manual_entry_data in enumerate(records):
+        label: str = f"Record {idx + 1}: {manual_entry_data.get('employee_name') or '-'}"
+        processor: Optional[IndProcessor] = None
+        try:
+            processor = IndProcessor()
+            processor.load_manual_entry(manual_entry_data)
+            processor.process_pdf_data()
+        except Exception as e:
+            logger.error(f"{label}: {e}")
+            failed_list.append(
+                {
+                    "record": label,
+                    "error": str(e)[:100],
+                    **(processor.journal_ref() if processor else {}),
+                }
+            )
+            run_progress.advance(failed=True)
+            continue
+        # Earlier committed records are already gone from the file.
+        ManualEntry.remove_records({idx - removed}, path)
+        removed += 1
+        processed_list.append(f"{label} ({processor.log_id})")
+        run_progress.advance()
+
+    return processed_list, failed_list
+
+
+def recover_incomplete_commits() -> list[str]:
+    """
+    Rolls forward every commit left incomplete in the journal by a crash.
+    Returns the recovered log IDs.
+    """
+    journal = CommitJournal()
+    recovered: list[str] = []
+    for commit_id, commit in journal.pending().items():
+        try:
+            processor = IndProcessor.from_journal_state(commit["state"])
+            processor.resume_commit(journal, commit_id, commit["steps"])
+            recovered.append(commit["log_id"])
+        except Exception as e:
+            logger.error(f"Unable to recover commit for '{commit['log_id']}': {e}")
+    return recovered
+
+
+def settle_unserialized_commits() -> None:
+    """
+    Rolls forward journaled commits that stopped before advancing the log ID
+    serial. Raises ValueError if one cannot be completed, since allocating
+    another ID would hand out the same one again.
+    """
+    journal = CommitJournal()
+    for commit_id, commit in journal.pending().items():
+        if "serial" in commit["steps"]:
+            continue
+        try:
+            processor = IndProcessor.from_journal_state(commit["state"])
+            processor.resume_commit(journal, commit_id, commit["steps"])
+        except Exception as e:
+            raise ValueError(
+                f"Commit for '{commit['log_id']}' is incomplete and could not be rolled forward: "
+                f"{e}. Resolve it before processing more awards."
+            )
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from constants import pathmanager
+
+
+class CommitJournal:
+    """
+    Write-ahead journal for award commits, stored as JSON lines. Entries are
+    keyed by a commit ID generated at `begin`, so a log ID that is reused
+    after a failure never merges two commits.
+    * begin: the award state needed to redo every commit step.
+    * step: a commit step that finished.
+    * complete: the award is fully committed.
+    The file is truncated whenever no commits are left pending.
+    """
+
+    def __init__(self, journal_path: Optional[Path] = None):
+        self.journal_path = journal_path if journal_path else pathmanager.commit_journal_path
+        self._lock = threading.Lock()
+
+    def _append(self, *entries: dict) -> None:
+        line: bytes = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+        with self._lock, open(self.journal_path, "ab+") as file:
+            if file.seek(0, 2) > 0:
+                file.seek(-1, 2)
+                if file.read(1) != b"\n":
+                    line = b"\n" + line
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def begin(self, log_id: str, state: dict) -> str:
+        """Journals a new commit and returns its commit ID."""
+        return self.begin_many([(log_id, state)])[0]
+
+    def begin_many(self, states: list[tuple[str, dict]]) -> list[str]:
+        """Journals several commits with a single fsync and returns their commit IDs."""
+        commit_ids: list[str] = [uuid.uuid4().hex for _ in states]
+        self._append(
+            *(
+                {"op": "begin", "commit_id": commit_id, "log_id": log_id, "state": state}
+                for commit_id, (log_id, state) in zip(commit_ids, states)
+            )
+        )
+        return commit_ids
+
+    def mark(self, commit_id: str, step: str) -> None:
+        self._append({"op": "step", "commit_id": commit_id, "step": step})
+
+    def mark_many(self, commit_ids: list[str], step: str) -> None:
+        self._append(
+            *({"op": "step", "commit_id": commit_id, "step": step} for commit_id in commit_ids)
+        )
+
+    def complete(self, commit_id: str) -> None:
+        self.complete_many([commit_id])
+
+    def complete_many(self, commit_ids: list[str]) -> None:
+        self._append(*({"op": "complete", "commit_id": commit_id} for commit_id in commit_ids))
+        with self._lock:
+            if not self.pending():
+                open(self.journal_path, "w").close()
+
+    def pending(self) -> dict[str, dict]:
+        """
+        Returns incomplete commits as
+        {commit_id: {"log_id": str, "state": dict, "steps": set}}.
+        A repeated begin never replaces a pending commit. A torn final line
+        from a crash mid-write is ignored. Entries written before commit IDs
+        existed are keyed by their log ID.
+        """
+        if not self.journal_path.exists():
+            return {}
+
+        commits: dict[str, dict] = {}
+        with open(self.journal_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry: dict = json.loads(line)
+                except ValueError:
+                    continue
+                commit_id = entry.get("commit_id", entry.get("log_id"))
+                if entry["op"] == "begin":
+                    commits.setdefault(
+                        commit_id,
+                        {"log_id": entry.get("log_id"), "state": entry["state"], "steps": set()},
+                    )
+                elif entry["op"] == "step" and commit_id in commits:
+                    commits[commit_id]["steps"].add(entry["step"])
+                elif entry["op"] == "complete":
+                    commits.pop(commit_id, None)
+        return commits
@@ -0,0 +1,90 @@
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from constants import pathmanager
+
+REFERENCE_PREFIX: str = "jstore:"
+
+
+class JustificationStore:
+    """
+    Append-only store of zlib-compressed justification texts keyed by log ID.
+    * data file: concatenated compressed blocks.
+    * index file: one `log_id<TAB>offset<TAB>length` line per block; the
+      last entry for a log ID wins.
+    """
+
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        index_path: Optional[Path] = None,
+    ):
+        self.data_path = data_path if data_path else pathmanager.justification_store_path
+        self.index_path = index_path if index_path else pathmanager.justification_index_path
+        self._index: Optional[dict[str, tuple[int, int]]] = None
+
+    @staticmethod
+    def reference(log_id: Optional[str]) -> Optional[str]:
+        """Returns the reference stored in ledger and TSV rows for a log ID."""
+        return f"{REFERENCE_PREFIX}{log_id}" if log_id else None
+
+    def _load_index(self) -> dict[str, tuple[int, int]]:
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 3:
+                        continue
+                    self._index[parts[0]] = (int(parts[1]), int(parts[2]))
+        return self._index
+
+    def put(self, log_id: str, text: Optional[str]) -> Optional[str]:
+        """
+        Compresses and appends the justification, returning its reference.
+        """
+        if not log_id or text is None:
+            return None
+        self.put_many({log_id: text})
+        return self.reference(log_id)
+
+    def put_many(self, texts: dict[str, Optional[str]]) -> None:
+        """
+        Compresses and appends several justifications with one write per file.
+        """
+        blocks: dict[str, bytes] = {
+            log_id: zlib.compress(text.encode("utf-8"), 9)
+            for log_id, text in texts.items()
+            if log_id and text is not None
+        }
+        if not blocks:
+            return
+
+        index = self._load_index()
+        index_lines: list[str] = []
+        with open(self.data_path, "ab") as file:
+            offset: int = file.seek(0, 2)
+            for log_id, block in blocks.items():
+                index[log_id] = (offset, len(block))
+                index_lines.append(f"{log_id}\t{offset}\t{len(block)}\n")
+                offset += len(block)
+            file.write(b"".join(blocks.values()))
+        with open(self.index_path, "a", encoding="utf-8") as file:
+            file.write("".join(index_lines))
+
+    def get(self, log_id_or_reference: str) -> Optional[str]:
+        """
+        Loads a justification by log ID or reference. Returns `None` when the
+        log ID has no stored text.
+        """
+        log_id = str(log_id_or_reference).removeprefix(REFERENCE_PREFIX)
+        entry = self._load_index().get(log_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        with open(self.data_path, "rb") as file:
+            file.seek(offset)
+            return zlib.decompress(file.read(length)).decode("utf-8")
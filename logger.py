@@ -1,12 +1,23 @@
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterator
 
 from constants import path_manager
 from rich.console import Console
 
 console = Console()
 
+LEVELS: dict[str, int] = {"INFO": 10, "WARNING": 20, "ERROR": 30, "PROMPT": 40}
+
 
 class Logger:
+    # Lowest level printed to the console. The log file always gets every line.
+    console_level: str = "INFO"
+    # Held for every log line and for the whole of a user prompt, so other
+    # threads wait at their next log line until the prompt is answered.
+    _output_lock = threading.RLock()
+
     def _log(
         self,
         message: str,
@@ -15,13 +26,18 @@ class Logger:
         linebreak=True,
     ):
         padding = "\n" if linebreak is True else ""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-4]
+        with Logger._output_lock:
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-4]
+            if LEVELS.get(level, 0) >= LEVELS[Logger.console_level]:
+                console.print(
+                    f"[{color}]{padding}{now} - {level}: {message}{padding}[/{color}]"
+                )
+            self._write(f"\n{padding}{now} - {level}: {message}{padding}")
 
-        console.print(
-            f"[{color}]{padding}{now} - {level}: {message}{padding}[/{color}]"
-        )
+    @staticmethod
+    def _write(text: str) -> None:
         with open(path_manager.logger_path, "a", encoding="utf-8") as f:
-            f.write(f"\n{padding}{now} - {level}: {message}{padding}")
+            f.write(text)
 
     def info(self, message):
         self._log(message, linebreak=False)
@@ -32,8 +48,24 @@ class Logger:
     def error(self, message):
         self._log(message, "ERROR", "red1")
 
+    def prompt(self, message):
+        """Logs a message the user must answer; printed at every console level."""
+        self._log(message, "PROMPT", "orange1")
+
+    @staticmethod
+    @contextmanager
+    def prompting() -> Iterator[None]:
+        """Holds back log lines from other threads while the user answers."""
+        with Logger._output_lock:
+            yield
+
     def path(self, message):
         self._log(message)
 
     def final(self, message):
         self._log(f"\n{message}")
+
+    def file_only(self, message):
+        """Writes a message to the log file without printing it."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-4]
+        self._write(f"\n{now} - INFO: {message}")
@@ -1,47 +1,493 @@
+import argparse
+from collections import Counter
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Optional
 
-from constants import testing_mode
-from ind_processor import IndProcessor
-from logger import Logger
-from utils import update_serial_numbers
+import run_progress
+from constants import pathmanager, testing_mode
+from logger import Logger, console
+from rich.table import Table
+from utils import list_ind_pdfs, set_aside_skipped, update_serial_numbers
 
 logger = Logger()
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Process IND award PDFs.")
+    parser.add_argument(
+        "--folder",
+        type=Path,
+        default=pathmanager.inbox_path,
+        help="Folder containing the award PDFs.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate every PDF without consuming log IDs, saving or archiving.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes used by the dry run and pipeline.",
+    )
+    parser.add_argument(
+        "--justification",
+        metavar="LOG_ID",
+        default=None,
+        help="Print the stored justification for a log ID and exit.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each file with cProfile and save an aggregate profile.",
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=float,
+        default=5.0,
+        help="Save per-file profiles for files slower than this many seconds.",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Record a tracemalloc snapshot diff for each profiled file.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Process files through the concurrent asyncio pipeline.",
+    )
+    parser.add_argument(
+        "--archive-workers",
+        type=int,
+        default=4,
+        help="Number of concurrent archive copies in pipeline mode.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=8,
+        help="Maximum number of files waiting between pipeline stages.",
+    )
+    parser.add_argument(
+        "--group-commit",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Commit awards in groups of N with one write per output file.",
+    )
+    parser.add_argument(
+        "--group-commit-ms",
+        type=int,
+        default=2000,
+        help="Commit a partial group once its oldest award is this old.",
+    )
+    parser.add_argument(
+        "--no-fsync",
+        action="store_true",
+        help="Skip the fsync after each group commit for higher throughput.",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print the fiscal-year award totals and exit.",
+    )
+    parser.add_argument(
+        "--rebuild-aggregates",
+        action="store_true",
+        help="Recompute the fiscal-year and per-employee totals from the JSON ledger and exit.",
+    )
+    parser.add_argument(
+        "--claim",
+        action="store_true",
+        help="Claim inbox files with leases so several workers on this host can share the inbox.",
+    )
+    parser.add_argument(
+        "--claim-check",
+        type=int,
+        metavar="PROCESSES",
+        default=None,
+        help="Run claim workers in this many local processes against a scratch inbox and check for double claims.",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Worker name used for claims (default: hostname-pid).",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300.0,
+        help="Seconds without a heartbeat before a worker's claims are reclaimed.",
+    )
+    parser.add_argument(
+        "--capture-template",
+        nargs=2,
+        metavar=("LAYOUT", "PDF"),
+        default=None,
+        help="Save the field regions of a fillable PDF as LAYOUT's flattened-form template.",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Re-run archived PDFs through the current rules and diff against the ledger.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Show a live progress bar and only errors on the console; the log file keeps every line.",
+    )
+    parser.add_argument(
+        "--console-level",
+        choices=["INFO", "WARNING", "ERROR"],
+        default=None,
+        help="Lowest log level printed to the console (default INFO, or ERROR with --quiet).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Compact PDFs (garbage-collect and deflate) before copying them to the archive.",
+    )
+    parser.add_argument(
+        "--compact-benchmark",
+        nargs="?",
+        const=pathmanager.archive_path,
+        type=Path,
+        default=None,
+        metavar="FOLDER",
+        help="Report the bytes and copy time compaction would save for a folder of PDFs.",
+    )
+    parser.add_argument(
+        "--schedule",
+        default="type,received",
+        metavar="KEYS",
+        help="Comma-separated priority keys (type, received, funding_org, size), "
+        "or 'none' to keep inbox order.",
+    )
+    parser.add_argument(
+        "--no-fairness",
+        action="store_true",
+        help="Do not round-robin between funding orgs within a priority class.",
+    )
+    parser.add_argument(
+        "--org-limit",
+        type=int,
+        default=None,
+        help="Maximum awards per funding org in flight at once.",
+    )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Cross-check the ledger, TSV output, serial file and tracker by log ID.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a warm extraction worker pool that --use-service runs submit to.",
+    )
+    parser.add_argument(
+        "--use-service",
+        action="store_true",
+        help="Send extraction, dry run and replay jobs to the worker pool started with --serve.",
+    )
+    parser.add_argument(
+        "--find",
+        metavar="QUERY",
+        help="Look up archived PDFs by log ID, employee or funding org in the archive catalog.",
+    )
+    parser.add_argument(
+        "--rescan-archive",
+        action="store_true",
+        help="Rebuild the archive catalog from the archive folder.",
+    )
+    parser.add_argument(
+        "--manual",
+        nargs="?",
+        const=pathmanager.manual_entry_path,
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Process every record in a YAML/CSV manual entry file.",
+    )
+    args = parser.parse_args()
+    if args.profile and (args.pipeline or args.claim or args.manual):
+        parser.error("--profile only supports the default one-file-at-a-time mode.")
+    if args.group_commit and (args.pipeline or args.claim or args.manual):
+        parser.error("--group-commit only supports the default one-file-at-a-time mode.")
+    return args
+
+
+def process_folder(
+    folder: Path, profiler=None, committer=None, scheduler=None
+) -> tuple[list[str], list[dict[str, str]]]:
+    """
+    Processes each PDF in the folder one at a time, in the order set by the
+    `AwardScheduler` when one is given. With a `GroupCommitter`, log IDs are
+    allocated and saved when each group is committed, and awards are
+    reported as processed or failed once their group's commit finishes.
+    """
+    from ind_processor import IndProcessor
+
+    processed_list: list[str] = []
+    failed_list: list[dict[str, str]] = []
+
+    skipped: list[Path] = []
+    pdf_paths: list[Path] = list_ind_pdfs(folder, skipped)
+    set_aside_skipped(skipped)
+    if scheduler is not None:
+        pdf_paths = [item.path for item in scheduler.order(pdf_paths)]
+    run_progress.set_total(len(pdf_paths))
+
+    for pdf_path in pdf_paths:
+        processor: Optional[IndProcessor] = None
+        try:
+            processor = IndProcessor(pdf_path, defer_log_id=committer is not None)
+            if profiler:
+                profiler.run(pdf_path.name, lambda: processor.process_pdf_data(committer))
+            else:
+                processor.process_pdf_data(committer)
+            if committer is None:
+                processed_list.append(pdf_path.name)
+                run_progress.advance()
+
+        except Exception as e:
+            logger.error(e)
+            failed_list.append(
+                {
+                    "file": pdf_path.name,
+                    "error": str(e)[:100],
+                    **(processor.journal_ref() if processor else {}),
+                }
+            )
+            run_progress.advance(failed=True)
+
+    if committer is not None:
+        committer.close()
+        processed_list.extend(processor.source_path.name for processor in committer.committed)
+        failed_list.extend(committer.failed)
+
+    return processed_list, failed_list
+
+
+def print_run_summary(processed_list: list[str], failed_list: list[dict[str, str]]) -> None:
+    """
+    Prints the end-of-run summary as one table and writes it to the log file.
+    A failure whose commit was already journaled is shown as recovered when
+    a later commit rolled it forward, or as pending recovery when the next
+    run will, since the award is saved either way.
+    """
+    from journal import CommitJournal
+
+    pending: set[str] = set(CommitJournal().pending())
+    statuses: dict[str, str] = {
+        "failed": "[red1]failed[/red1]",
+        "recovered": "[yellow1]recovered[/yellow1]",
+        "pending recovery": "[orange1]pending recovery[/orange1]",
+    }
+    rows: list[tuple[str, str, str]] = []
+    for failed in failed_list:
+        name: str = str(failed.get("file") or failed.get("record") or "-")
+        error: str = str(failed.get("error") or "-").strip().split("\n")[0][:100]
+        status: str = "failed"
+        if failed.get("commit_id"):
+            status = "pending recovery" if failed["commit_id"] in pending else "recovered"
+        rows.append((name, status, error))
+    counts: Counter = Counter(status for _, status, _ in rows)
+
+    table = Table(
+        title="Run Summary",
+        caption=(
+            f"Processed: {len(processed_list)}    Recovered: {counts['recovered']}    "
+            f"Pending recovery: {counts['pending recovery']}    Failed: {counts['failed']}"
+        ),
+    )
+    table.add_column("File", overflow="fold")
+    table.add_column("Status")
+    table.add_column("Error", overflow="fold")
+    for processed in processed_list:
+        table.add_row(processed, "[spring_green3]processed[/spring_green3]", "-")
+        logger.file_only(f"Processed: {processed}")
+    for name, status, error in rows:
+        table.add_row(name, statuses[status], error)
+        logger.file_only(f"{status.capitalize()}: {name}: {error}")
+    console.print(table)
+
+
+def run_mode(
+    args: argparse.Namespace, folder: Path, profiler=None, scheduler=None
+) -> tuple[list[str], list[dict[str, str]]]:
+    """Runs the processing mode selected on the command line."""
+    if args.manual:
+        from ind_processor import process_manual_batch
+
+        return process_manual_batch(args.manual)
+
+    if args.claim:
+        from work_claims import WorkClaimer, run_claim_worker
+
+        claimer = WorkClaimer(
+            folder,
+            worker_id=args.worker_id,
+            lease_seconds=args.lease_seconds,
+            scheduler=scheduler,
+        )
+        return run_claim_worker(claimer)
+
+    if args.pipeline:
+        from pipeline import PipelineConfig, run_pipeline
+
+        config = PipelineConfig(
+            extract_workers=args.workers,
+            archive_concurrency=args.archive_workers,
+            queue_size=args.queue_size,
+        )
+        return run_pipeline(folder, config, scheduler)
+
+    committer = None
+    if args.group_commit:
+        from group_commit import GroupCommitter
+
+        committer = GroupCommitter(
+            max_awards=args.group_commit,
+            max_wait_ms=args.group_commit_ms,
+            durable=not args.no_fsync,
+        )
+    return process_folder(folder, profiler, committer, scheduler)
+
+
 def main():
+    args = parse_args()
+    Logger.console_level = args.console_level or ("ERROR" if args.quiet else "INFO")
+    folder: Path = args.folder
+
+    if args.justification:
+        from justification_store import JustificationStore
+
+        text = JustificationStore().get(args.justification)
+        print(text if text is not None else f"No justification stored for {args.justification}")
+        return
+
+    if args.claim_check:
+        from work_claims import check_claims
+
+        check_claims(args.claim_check, lease_seconds=args.lease_seconds)
+        return
+
+    if args.capture_template:
+        from region_extract import RegionTemplates
+
+        layout_name, pdf_path = args.capture_template
+        RegionTemplates().capture(layout_name, Path(pdf_path))
+        return
+
+    if args.report or args.rebuild_aggregates:
+        from aggregates import AwardAggregates
+
+        aggregates = AwardAggregates()
+        if args.rebuild_aggregates:
+            aggregates.rebuild()
+        if args.report:
+            aggregates.report()
+        return
+
+    if args.compact_benchmark:
+        from archive_store import benchmark_compaction
+
+        benchmark_compaction(args.compact_benchmark)
+        return
+
+    if args.compact:
+        from archive_store import ArchiveStore
+
+        ArchiveStore.compact = True
+
+    if args.reconcile:
+        from reconcile import reconcile
+
+        reconcile()
+        return
+
+    if args.serve:
+        from worker_service import WorkerService
+
+        WorkerService(workers=args.workers).serve()
+        return
+
+    if args.find or args.rescan_archive:
+        from archive_catalog import ArchiveCatalog
+
+        catalog = ArchiveCatalog()
+        if args.rescan_archive:
+            catalog.rescan()
+        if args.find:
+            catalog.print_matches(args.find)
+        return
+
+    if args.replay:
+        from replay import run_replay
+
+        run_replay(workers=args.workers, use_service=args.use_service)
+        return
+
+    if args.dry_run:
+        from dry_run import run_dry_run
+
+        run_dry_run(folder, workers=args.workers, use_service=args.use_service)
+        return
+
+    profiler = None
+    if args.profile:
+        from profiling import RunProfiler
+
+        profiler = RunProfiler(
+            threshold=args.profile_threshold, trace_memory=args.profile_memory
+        )
+
     if not testing_mode:
         update_serial_numbers()
+
+    if not args.claim:
+        from ind_processor import recover_incomplete_commits
+
+        recovered: list[str] = recover_incomplete_commits()
+        if recovered:
+            logger.warning(f"Recovered interrupted commits: {recovered}")
+
+    service = None
+    if args.use_service:
+        from ind_processor import IndProcessor
+        from worker_service import ServiceExtractor
+
+        service = IndProcessor.service = ServiceExtractor()
+
     try:
-        processed_list: list[str] = []
-        failed_list: list[dict[str, str]] = []
-
-        folder: Path
-
-        for pdf_path in folder.iterdir():
-            if pdf_path.is_file() and pdf_path.suffix == ".pdf":
-                if "GRP" in pdf_path.name in pdf_path.name:
-                    continue
-                try:
-                    processor = IndProcessor(pdf_path)
-                    processor.process_pdf_data()
-                    processed_list.append(pdf_path.name)
-
-                except Exception as e:
-                    logger.error(e)
-                    failed_list.append({"file": pdf_path.name, "error": {str(e)[:100]}})
-
-        logger.info(f"\n\nProcessed Files Count: {len(processed_list)}")
-        if processed_list:
-            [logger.info(f"- {processed}") for processed in processed_list]
-
-        logger.info(f"\n\nProcess Failure Count: {len(failed_list)}")
-        for failed in failed_list:
-            for k, v in failed.items():
-                logger.info(f"- {k}: {str(v)[:100]}...")
-            print()
+        scheduler = None
+        if args.schedule.lower() != "none":
+            from scheduler import AwardScheduler, SchedulerConfig
+
+            scheduler = AwardScheduler(
+                SchedulerConfig(
+                    priority=tuple(key.strip() for key in args.schedule.split(",") if key.strip()),
+                    fair=not args.no_fairness,
+                    org_limit=args.org_limit,
+                )
+            )
+
+        live = run_progress.RunProgress() if args.quiet else nullcontext()
+        with live:
+            processed_list, failed_list = run_mode(args, folder, profiler, scheduler)
+        print_run_summary(processed_list, failed_list)
 
     except Exception as e:
         logger.error(e)
+    finally:
+        if service is not None:
+            service.close()
+
+    if profiler:
+        profiler.finish()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import run_progress
+from duplicates import award_fingerprint
+from ind_processor import IndProcessor, extract_pdf_fields
+from journal import CommitJournal
+from logger import Logger
+from scheduler import AwardScheduler, SchedulerConfig, WorkItem
+from utils import list_ind_pdfs, set_aside_skipped
+
+logger = Logger()
+
+
+@dataclass
+class PipelineConfig:
+    """
+    Concurrency and queue bounds for each pipeline stage.
+    The commit stage always runs one award at a time so log IDs stay
+    sequential.
+    """
+
+    extract_workers: Optional[int] = None
+    read_concurrency: int = 4
+    transform_concurrency: int = 1
+    archive_concurrency: int = 4
+    queue_size: int = 8
+
+
+@dataclass
+class PipelineResults:
+    processed: list[str] = field(default_factory=list)
+    failed: list[dict[str, str]] = field(default_factory=list)
+
+
+async def _run_stage(
+    name: str,
+    func: Callable[[IndProcessor], Awaitable[IndProcessor]],
+    inbox: asyncio.Queue,
+    outbox: Optional[asyncio.Queue],
+    concurrency: int,
+    downstream_concurrency: int,
+    results: PipelineResults,
+    on_done: Optional[Callable[[IndProcessor], None]] = None,
+) -> None:
+    """
+    Runs `concurrency` workers that pull from `inbox` until they receive a
+    `None` sentinel. Failed items are recorded and not forwarded. Once all
+    workers finish, one sentinel per downstream worker is queued.
+    `on_done` is called for each item that fails here or leaves the last stage.
+    """
+
+    async def worker() -> None:
+        while True:
+            processor: Optional[IndProcessor] = await inbox.get()
+            if processor is None:
+                break
+            file_name: str = processor.source_path.name
+            try:
+                processor = await func(processor)
+            except Exception as e:
+                logger.error(f"{name} failed for '{file_name}': {e}")
+                results.failed.append(
+                    {"file": file_name, "error": str(e)[:100], **processor.journal_ref()}
+                )
+                run_progress.advance(failed=True)
+                if on_done:
+                    on_done(processor)
+                continue
+            if outbox is None:
+                results.processed.append(file_name)
+                run_progress.advance()
+                if on_done:
+                    on_done(processor)
+            else:
+                await outbox.put(processor)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    if outbox is not None:
+        for _ in range(downstream_concurrency):
+            await outbox.put(None)
+
+
+async def run_pipeline_async(
+    folder: Path,
+    config: Optional[PipelineConfig] = None,
+    scheduler: Optional[AwardScheduler] = None,
+) -> PipelineResults:
+    """
+    Processes a folder through discovery, extraction, transform, commit and
+    archive stages joined by bounded queues. A full queue blocks the stage
+    feeding it, so slow archive copies throttle discovery instead of
+    piling up parsed files in memory. With a scheduler, discovery feeds files
+    in priority order and holds back orgs at their in-flight limit. Awards
+    matching one transformed earlier in the run are flagged as duplicates,
+    since the duplicate index only sees committed awards. While a
+    transform prompt waits for the user, the other stages stop at their next
+    log line, so the prompt is not interleaved with their output.
+    """
+    config = config if config else PipelineConfig()
+    scheduler = scheduler if scheduler else AwardScheduler(SchedulerConfig(priority=(), fair=False))
+    results = PipelineResults()
+    journal = CommitJournal()
+    loop = asyncio.get_running_loop()
+    fingerprints: dict[str, IndProcessor] = {}
+    fingerprints_lock = threading.Lock()
+
+    extract_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+    transform_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+    commit_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+    archive_queue: asyncio.Queue = asyncio.Queue(config.queue_size)
+
+    with ProcessPoolExecutor(max_workers=config.extract_workers) as pool:
+
+        async def discover() -> None:
+            skipped: list[Path] = []
+            pdf_paths: list[Path] = list_ind_pdfs(folder, skipped)
+            set_aside_skipped(skipped)
+            pending: list[WorkItem] = scheduler.order(pdf_paths)
+            run_progress.set_total(len(pending))
+            while pending:
+                item: Optional[WorkItem] = scheduler.ready(pending)
+                if item is None:
+                    await asyncio.sleep(0.05)
+                    continue
+                pending.remove(item)
+                try:
+                    processor = IndProcessor(item.path, defer_log_id=True)
+                except Exception as e:
+                    logger.error(e)
+                    results.failed.append({"file": item.path.name, "error": str(e)[:100]})
+                    run_progress.advance(failed=True)
+                    continue
+                scheduler.start(item)
+                await extract_queue.put(processor)
+            for _ in range(config.read_concurrency):
+                await extract_queue.put(None)
+
+        def done(processor: IndProcessor) -> None:
+            scheduler.finish(processor.source_path)
+
+        async def extract(processor: IndProcessor) -> IndProcessor:
+            pdf_bytes: bytes = await asyncio.to_thread(processor.read_pdf_bytes)
+            pdf_data = None
+            if IndProcessor.service is not None:
+                pdf_data = await asyncio.to_thread(IndProcessor.service.extract, pdf_bytes)
+            if pdf_data is None:
+                pdf_data = await loop.run_in_executor(pool, extract_pdf_fields, pdf_bytes)
+            processor.populate_attributes(pdf_data)
+            return processor
+
+        def transform_sync(processor: IndProcessor) -> None:
+            processor._validate_and_transform()
+            # The duplicate index only learns of an award once it commits,
+            # so awards earlier in this run are checked here.
+            fingerprint: str = award_fingerprint(processor._record())
+            with fingerprints_lock:
+                earlier: IndProcessor = fingerprints.setdefault(fingerprint, processor)
+            if earlier is not processor:
+                processor._prompt_user_action(
+                    f"Suspected duplicate of '{earlier.source_path.name}' earlier in this run: "
+                    "same employee, amounts, type and justification."
+                )
+
+        async def transform(processor: IndProcessor) -> IndProcessor:
+            await asyncio.to_thread(transform_sync, processor)
+            return processor
+
+        def commit_sync(processor: IndProcessor) -> None:
+            # Awards ahead of this one were transformed concurrently; the
+            # caps are checked again once they are in the totals.
+            processor._validate_fiscal_year_caps()
+            processor.assign_log_id(processor.category)
+            processor.commit_id = journal.begin(processor.log_id, processor._journal_state())
+            processor._run_commit_steps(
+                journal, ("justification", "ledger", "aggregates", "tsv", "serial")
+            )
+
+        def archive_sync(processor: IndProcessor) -> None:
+            processor._run_commit_steps(journal, ("archive",))
+            journal.complete(processor.commit_id)
+            processor.commit_id = None
+
+        async def commit(processor: IndProcessor) -> IndProcessor:
+            await asyncio.to_thread(commit_sync, processor)
+            return processor
+
+        async def archive(processor: IndProcessor) -> IndProcessor:
+            await asyncio.to_thread(archive_sync, processor)
+            logger.final(processor)
+            return processor
+
+        await asyncio.gather(
+            discover(),
+            _run_stage(
+                "Extraction", extract, extract_queue, transform_queue,
+                config.read_concurrency, config.transform_concurrency, results, done,
+            ),
+            _run_stage(
+                "Transform", transform, transform_queue, commit_queue,
+                config.transform_concurrency, 1, results, done,
+            ),
+            _run_stage(
+                "Commit", commit, commit_queue, archive_queue,
+                1, config.archive_concurrency, results, done,
+            ),
+            _run_stage(
+                "Archive", archive, archive_queue, None,
+                config.archive_concurrency, 0, results, done,
+            ),
+        )
+
+    return results
+
+
+def run_pipeline(
+    folder: Path,
+    config: Optional[PipelineConfig] = None,
+    scheduler: Optional[AwardScheduler] = None,
+) -> tuple[list[str], list[dict[str, str]]]:
+    """Synchronous entry point returning processed and failed file lists."""
+    results = asyncio.run(run_pipeline_async(folder, config, scheduler))
+    return results.processed, results.failed
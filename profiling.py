@@ -0,0 +1,108 @@
+import cProfile
+import pstats
+import re
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+from constants import pathmanager
+from logger import Logger
+
+logger = Logger()
+
+
+def _func_label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    return f"{Path(filename).name}:{line}({name})".replace(";", ":").replace(" ", "_")
+
+
+class RunProfiler:
+    """
+    Profiles each processed file with cProfile.
+    * threshold: float - seconds above which a file's pstats are saved.
+    * trace_memory: bool - record a tracemalloc snapshot diff per file.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 5.0,
+        output_dir: Optional[Path] = None,
+        trace_memory: bool = False,
+    ):
+        self.threshold = threshold
+        self.output_dir = output_dir if output_dir else pathmanager.profile_dir
+        self.trace_memory = trace_memory
+        self.aggregate: Optional[pstats.Stats] = None
+        self.timings: list[tuple[str, float]] = []
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.trace_memory:
+            tracemalloc.start()
+
+    def run(self, name: str, func: Callable[[], None]) -> None:
+        """Runs `func` under cProfile and records its stats under `name`."""
+        before = tracemalloc.take_snapshot() if self.trace_memory else None
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.runcall(func)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.append((name, elapsed))
+            stats = pstats.Stats(profile)
+            if self.aggregate is None:
+                self.aggregate = stats
+            else:
+                self.aggregate.add(stats)
+
+            stem = re.sub(r"[^a-zA-Z0-9_.-]+", "_", Path(name).stem)
+            if elapsed > self.threshold:
+                stats_path = self.output_dir / f"{stem}.pstats"
+                stats.dump_stats(stats_path)
+                logger.warning(f"'{name}' took {elapsed:.2f}s, profile saved to '{stats_path.name}'")
+            if before is not None:
+                self._save_memory_diff(stem, before)
+
+    def _save_memory_diff(self, stem: str, before: tracemalloc.Snapshot) -> None:
+        after = tracemalloc.take_snapshot()
+        top_stats = after.compare_to(before, "lineno")[:25]
+        with open(self.output_dir / f"{stem}.memory.txt", "w", encoding="utf-8") as file:
+            file.write("\n".join(str(stat) for stat in top_stats) + "\n")
+
+    def _write_collapsed(self, path: Path) -> None:
+        """
+        Writes caller;callee edges with self time in microseconds, in the
+        collapsed-stack format read by flamegraph tools. cProfile records only
+        one level of callers, so stacks are two frames deep.
+        """
+        lines: list[str] = []
+        for func, (_, _, tt, _, callers) in self.aggregate.stats.items():
+            label = _func_label(func)
+            if not callers:
+                lines.append(f"{label} {int(tt * 1e6)}")
+                continue
+            for caller, caller_stats in callers.items():
+                caller_tt = caller_stats[2]
+                lines.append(f"{_func_label(caller)};{label} {int(caller_tt * 1e6)}")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(line for line in lines if not line.endswith(" 0")) + "\n")
+
+    def finish(self) -> None:
+        """Saves the aggregated profile and collapsed stacks for the run."""
+        if self.trace_memory:
+            tracemalloc.stop()
+        if self.aggregate is None:
+            return
+
+        aggregate_path = self.output_dir / "aggregate.pstats"
+        self.aggregate.dump_stats(aggregate_path)
+        self._write_collapsed(self.output_dir / "aggregate.collapsed")
+
+        total = sum(elapsed for _, elapsed in self.timings)
+        slowest = sorted(self.timings, key=lambda t: t[1], reverse=True)[:5]
+        logger.info(
+            f"Profiled {len(self.timings)} files in {total:.2f}s. Slowest:\n"
+            + "\n".join(f"- {name}: {elapsed:.2f}s" for name, elapsed in slowest)
+        )
+        logger.info(f"Aggregate profile saved to '{aggregate_path}'")
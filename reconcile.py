@@ -0,0 +1,210 @@
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from constants import Tracker, active_fiscal_year, pathmanager
+from logger import Logger
+from rich.console import Console
+from rich.table import Table
+from utils import load_json_ledger, stream_tsv_rows
+
+console = Console()
+logger = Logger()
+
+# Ledger field held in each TSV column, in `IndProcessor._tsv_row` order.
+# None marks columns with no ledger counterpart.
+TSV_COLUMNS: tuple[Optional[str], ...] = (
+    "log_id",
+    "date_received",
+    None,
+    "category",
+    "type",
+    "employee_name",
+    "monetary_amount",
+    "time_off_amount",
+    "employee_pay_plan",
+    "employee_org",
+    "employee_supervisor_name",
+    None,
+    "nominator_name",
+    "funding_org",
+    "mb_division",
+    None,
+    "value",
+    "extent",
+)
+
+
+def _tsv_value(value) -> str:
+    """Normalizes a ledger or TSV value; None, blank and '-' all read as '-'."""
+    if value is None:
+        return "-"
+    value = str(value)
+    return "-" if value.strip() in ("", "-") else value
+
+
+def _split_log_id(log_id: str) -> Optional[tuple[str, int]]:
+    """Returns (category, serial) for a current fiscal year log ID."""
+    parts: list[str] = str(log_id).split("-")
+    if len(parts) != 3 or parts[0] != str(active_fiscal_year)[-2:]:
+        return None
+    try:
+        return parts[1], int(parts[2])
+    except ValueError:
+        return None
+
+
+def _read_serial_file() -> dict[str, int]:
+    with open(pathmanager.serial_path, "r", encoding="utf-8") as file:
+        data = yaml.safe_load(file)
+    return data if isinstance(data, dict) else {}
+
+
+def _read_tracker() -> dict[str, int]:
+    """Reads the last serials recorded in the tracker, if it can be opened."""
+    import warnings
+
+    import openpyxl
+
+    warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+    try:
+        wb = openpyxl.load_workbook(Tracker.file_path, read_only=True, data_only=True)
+        sheet = wb[Tracker.sheet_name]
+        values = {
+            "IND": int(str(sheet[Tracker.ind_coord].value)[-3:]),
+            "GRP": int(str(sheet[Tracker.grp_coord].value)[-3:]),
+        }
+        wb.close()
+        return values
+    except Exception as e:
+        logger.warning(f"Unable to read tracker: {e}")
+        return {}
+    finally:
+        warnings.resetwarnings()
+
+
+def reconcile(report_path: Optional[Path] = None) -> list[dict[str, object]]:
+    """
+    Joins the JSON ledger and the TSV output on log ID with hash maps, each
+    source read once, and checks per-category serials against the serial
+    file and tracker. Writes one JSON line per finding and prints a summary.
+    """
+    report_path = report_path if report_path else pathmanager.reconcile_report_path
+    findings: list[dict[str, object]] = []
+    serials: dict[str, set[int]] = defaultdict(set)
+
+    ledger: dict[str, dict] = {}
+    ledger_counts: Counter[str] = Counter()
+    for record in load_json_ledger():
+        log_id = str(record.get("log_id"))
+        ledger_counts[log_id] += 1
+        ledger[log_id] = record
+    for log_id, count in ledger_counts.items():
+        if count > 1:
+            findings.append({"kind": "duplicate_ledger", "log_id": log_id, "count": count})
+
+    tsv_seen: Counter[str] = Counter()
+    for line_no, log_id, columns, line_count in stream_tsv_rows(pathmanager.tsv_output_path):
+        if log_id is None:
+            findings.append({"kind": "unparsed_tsv", "line": line_no})
+            continue
+        if line_count > 1:
+            findings.append(
+                {"kind": "legacy_multiline", "log_id": log_id, "line": line_no, "lines": line_count}
+            )
+        tsv_seen[log_id] += 1
+        if tsv_seen[log_id] == 2:
+            findings.append({"kind": "duplicate_tsv", "log_id": log_id, "line": line_no})
+        split = _split_log_id(log_id)
+        if split:
+            serials[split[0]].add(split[1])
+        record: Optional[dict] = ledger.get(log_id)
+        if record is None:
+            findings.append({"kind": "extra_tsv", "log_id": log_id, "line": line_no})
+            continue
+        tsv_values: list[str] = [
+            _tsv_value(columns[idx] if idx < len(columns) else None)
+            for idx in range(len(TSV_COLUMNS))
+        ]
+        mismatched: dict[str, list[str]] = {
+            field: [_tsv_value(record.get(field)), tsv_values[idx]]
+            for idx, field in enumerate(TSV_COLUMNS)
+            if field and _tsv_value(record.get(field)) != tsv_values[idx]
+        }
+        if mismatched:
+            findings.append({"kind": "mismatch", "log_id": log_id, "line": line_no, "fields": mismatched})
+
+    for log_id in ledger:
+        split = _split_log_id(log_id)
+        if split:
+            serials[split[0]].add(split[1])
+        if log_id not in tsv_seen:
+            findings.append({"kind": "missing_tsv", "log_id": log_id})
+
+    serial_file: dict[str, int] = _read_serial_file()
+    tracker: dict[str, int] = _read_tracker()
+    serial_rows: list[tuple[str, str, str, str, str]] = []
+    for category in sorted(set(serials) | set(serial_file)):
+        used: set[int] = serials.get(category, set())
+        highest: int = max(used) if used else 0
+        gaps: list[int] = sorted(set(range(min(used), highest + 1)) - used) if used else []
+        if gaps:
+            findings.append({"kind": "serial_gap", "category": category, "serials": gaps})
+        next_serial: Optional[int] = serial_file.get(category)
+        if isinstance(next_serial, int) and next_serial <= highest:
+            findings.append(
+                {
+                    "kind": "serial_overlap",
+                    "category": category,
+                    "serial_file": next_serial,
+                    "highest_used": highest,
+                }
+            )
+        tracker_serial: Optional[int] = tracker.get(category)
+        if tracker_serial is not None and isinstance(next_serial, int) and tracker_serial > next_serial:
+            findings.append(
+                {
+                    "kind": "tracker_ahead",
+                    "category": category,
+                    "tracker": tracker_serial,
+                    "serial_file": next_serial,
+                }
+            )
+        serial_rows.append(
+            (category, str(highest), str(next_serial), str(tracker_serial), str(len(gaps)))
+        )
+
+    with open(report_path, "w", encoding="utf-8") as file:
+        for finding in findings:
+            file.write(json.dumps(finding) + "\n")
+
+    kind_counts: Counter[str] = Counter(finding["kind"] for finding in findings)
+    table = Table(title="Reconciliation Summary")
+    table.add_column("Finding")
+    table.add_column("Count", justify="right")
+    for kind in (
+        "missing_tsv",
+        "extra_tsv",
+        "unparsed_tsv",
+        "legacy_multiline",
+        "mismatch",
+        "duplicate_ledger",
+        "duplicate_tsv",
+        "serial_gap",
+        "serial_overlap",
+        "tracker_ahead",
+    ):
+        table.add_row(kind, str(kind_counts[kind]))
+    console.print(table)
+
+    serial_table = Table(title="Serials")
+    for column in ("Category", "Highest Used", "Serial File", "Tracker", "Gaps"):
+        serial_table.add_column(column)
+    for row in serial_rows:
+        serial_table.add_row(*row)
+    console.print(serial_table)
+    logger.info(f"Reconciliation report saved to '{report_path.name}'")
+
+    return findings
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import pickle
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from formatting import Formatter
+from trigram_index import TrigramIndex
+
+SNAPSHOT_VERSION: int = 2
+
+
+@dataclass
+class ReferenceSnapshot:
+    """
+    Reference data compiled from the reference YAML file.
+    * org_index: (org, normalized org, [(division, normalized division), ...])
+      with divisions in the reversed order `find_organization` checks them.
+    * mb_index: (org, normalized org, [normalized division, ...]).
+    * eval_limits: (value, extent) -> (monetary limit, time-off limit).
+    * employee_fy_caps: (monetary cap, time-off cap) per employee per fiscal
+      year; None means no cap.
+    """
+
+    source_mtime_ns: int
+    source_size: int
+    source_sha256: str
+    division_map: dict[str, list[str]]
+    mb_map: dict[str, list[str]]
+    consultant_map: dict[str, str]
+    value_options: tuple[str, ...]
+    extent_options: tuple[str, ...]
+    monetary_matrix: tuple[tuple[int, ...], ...]
+    time_off_matrix: tuple[tuple[int, ...], ...]
+    employee_fy_caps: tuple[Optional[int], Optional[int]] = (None, None)
+    org_index: list[tuple[str, str, list[tuple[str, str]]]] = field(default_factory=list)
+    mb_index: list[tuple[str, str, list[str]]] = field(default_factory=list)
+    eval_limits: dict[tuple[str, str], tuple[int, int]] = field(default_factory=dict)
+    org_trigrams: TrigramIndex = field(default_factory=TrigramIndex)
+    mb_trigrams: TrigramIndex = field(default_factory=TrigramIndex)
+    version: int = SNAPSHOT_VERSION
+
+
+def _normalize(text: str) -> str:
+    return Formatter(text).standardized_org_div() or ""
+
+
+def compile_snapshot(source_path: Path) -> ReferenceSnapshot:
+    """Parses the reference YAML and precomputes every derived lookup."""
+    raw: bytes = source_path.read_bytes()
+    data: dict = yaml.safe_load(raw) or {}
+    evaluation: dict = data.get("evaluation") or {}
+    caps: dict = evaluation.get("employee_fy_caps") or {}
+    stat = source_path.stat()
+
+    snapshot = ReferenceSnapshot(
+        source_mtime_ns=stat.st_mtime_ns,
+        source_size=stat.st_size,
+        source_sha256=hashlib.sha256(raw).hexdigest(),
+        division_map=data.get("division_map") or {},
+        mb_map=data.get("mb_map") or {},
+        consultant_map=data.get("consultant_map") or {},
+        value_options=tuple(evaluation.get("value_options") or ()),
+        extent_options=tuple(evaluation.get("extent_options") or ()),
+        monetary_matrix=tuple(tuple(row) for row in evaluation.get("monetary_matrix") or ()),
+        time_off_matrix=tuple(tuple(row) for row in evaluation.get("time_off_matrix") or ()),
+        employee_fy_caps=(caps.get("monetary") or None, caps.get("time_off") or None),
+    )
+
+    for target_org, div_list in snapshot.division_map.items():
+        formatted_org = _normalize(target_org)
+        snapshot.org_trigrams.add(formatted_org, (target_org, ""))
+        formatted_org = formatted_org.split("(")[0] if "(" in formatted_org else formatted_org
+        divisions: list[tuple[str, str]] = []
+        for target_div in reversed(div_list):
+            formatted_div = _normalize(target_div)
+            divisions.append((target_div, formatted_div))
+            snapshot.org_trigrams.add(formatted_div, (target_org, target_div))
+        snapshot.org_index.append((target_org, formatted_org, divisions))
+
+    for org, div_list in snapshot.mb_map.items():
+        formatted_org = _normalize(org)
+        formatted_divs = [_normalize(div) for div in div_list]
+        snapshot.mb_index.append((org, formatted_org, formatted_divs))
+        snapshot.mb_trigrams.add(formatted_org, org)
+        for formatted_div in formatted_divs:
+            snapshot.mb_trigrams.add(formatted_div, org)
+
+    for val_idx, value in enumerate(snapshot.value_options):
+        for ext_idx, extent in enumerate(snapshot.extent_options):
+            snapshot.eval_limits[(value, extent)] = (
+                snapshot.monetary_matrix[val_idx][ext_idx],
+                snapshot.time_off_matrix[val_idx][ext_idx],
+            )
+
+    return snapshot
+
+
+def _load_cached(snapshot_path: Path) -> Optional[ReferenceSnapshot]:
+    """
+    Returns the pickled snapshot, or None if it is missing, corrupt or was
+    written by code whose classes no longer unpickle, so it gets rebuilt.
+    """
+    try:
+        with open(snapshot_path, "rb") as file:
+            snapshot = pickle.load(file)
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        TypeError,
+        ValueError,
+    ):
+        return None
+    if not isinstance(snapshot, ReferenceSnapshot) or snapshot.version != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def load_reference_data(
+    source_path: Path, snapshot_path: Optional[Path] = None
+) -> ReferenceSnapshot:
+    """
+    Returns the compiled reference data, reusing the pickled snapshot while
+    the source file is unchanged. The source is only hashed when its mtime
+    or size differs from the snapshot's, and only recompiled when its
+    content actually changed.
+    """
+    snapshot_path = snapshot_path if snapshot_path else source_path.with_suffix(".snapshot.pickle")
+    stat = source_path.stat()
+    snapshot = _load_cached(snapshot_path)
+
+    if snapshot is not None:
+        if (snapshot.source_mtime_ns, snapshot.source_size) == (stat.st_mtime_ns, stat.st_size):
+            return snapshot
+        source_sha256 = hashlib.sha256(source_path.read_bytes()).hexdigest()
+        if source_sha256 != snapshot.source_sha256:
+            snapshot = None
+        else:
+            snapshot.source_mtime_ns, snapshot.source_size = stat.st_mtime_ns, stat.st_size
+
+    if snapshot is None:
+        snapshot = compile_snapshot(source_path)
+
+    # Each process writes its own temp file, so concurrent starts never
+    # interleave writes; the last os.replace wins with a complete file.
+    temp_path = snapshot_path.with_suffix(f".{os.getpid()}-{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, "wb") as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return snapshot
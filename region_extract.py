@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import fitz
+from constants import pathmanager
+from formatting import Formatter
+from logger import Logger
+
+logger = Logger()
+
+CHECKBOX_WIDGET_TYPES: tuple[int, ...] = (
+    fitz.PDF_WIDGET_TYPE_CHECKBOX,
+    fitz.PDF_WIDGET_TYPE_RADIOBUTTON,
+)
+
+
+class RegionTemplates:
+    """
+    Bounding-box templates for reading flattened (widget-less) PDFs.
+    Each template maps a layout's form field names to the page and rect the
+    widget occupied on the fillable form, so only those regions are read
+    instead of the whole page text.
+
+    Templates are captured from a fillable copy of the form with `capture`
+    and cached in memory until the template file changes.
+    """
+
+    _instance: Optional["RegionTemplates"] = None
+    _mtime: Optional[float] = None
+
+    def __init__(self, templates_path: Optional[Path] = None):
+        self.templates_path = templates_path if templates_path else pathmanager.region_templates_path
+        self.templates: dict[str, dict] = {}
+        self.compiled: dict[str, list[tuple[str, int, fitz.Rect, bool]]] = {}
+        if self.templates_path.exists():
+            with open(self.templates_path, "r", encoding="utf-8") as file:
+                self.templates = json.load(file)
+        for layout_name, template in self.templates.items():
+            self.compiled[layout_name] = [
+                (field_name, region["page"], fitz.Rect(region["rect"]), region["checkbox"])
+                for field_name, region in template["fields"].items()
+            ]
+
+    @classmethod
+    def get(cls) -> "RegionTemplates":
+        path: Path = pathmanager.region_templates_path
+        mtime: Optional[float] = path.stat().st_mtime if path.exists() else None
+        if cls._instance is None or mtime != cls._mtime:
+            cls._instance = RegionTemplates()
+            cls._mtime = mtime
+        return cls._instance
+
+    def has_template(self, page_count: int) -> bool:
+        """Returns True if any template fits a PDF with `page_count` pages."""
+        return any(
+            template["page_count"] == page_count for template in self.templates.values()
+        )
+
+    def capture(self, layout_name: str, pdf_path: Path) -> int:
+        """
+        Records the widget rects of a fillable PDF as the template for
+        `layout_name`. Returns the number of fields captured.
+        """
+        fields: dict[str, dict] = {}
+        with fitz.open(pdf_path) as doc:
+            page_count: int = doc.page_count
+            for page in doc:
+                for widget in page.widgets():
+                    key = Formatter(widget.field_name).key()
+                    fields[key] = {
+                        "page": page.number,
+                        "rect": list(widget.rect),
+                        "checkbox": widget.field_type in CHECKBOX_WIDGET_TYPES,
+                    }
+        if not fields:
+            raise ValueError(f"No form fields found in '{pdf_path.name}'.")
+
+        self.templates[layout_name] = {"page_count": page_count, "fields": fields}
+        with open(self.templates_path, "w", encoding="utf-8") as file:
+            json.dump(self.templates, file, indent=4)
+        logger.info(f"Captured {len(fields)} field regions for layout '{layout_name}'.")
+        return len(fields)
+
+    def _read_regions(
+        self,
+        doc: fitz.Document,
+        regions: list[tuple[str, int, fitz.Rect, bool]],
+        textpages: dict[int, tuple[fitz.Page, fitz.TextPage]],
+    ) -> dict[str, Optional[str]]:
+        """
+        Reads each region from its page's text, parsed once per page. A text
+        page only serves the page object it was built from, so both are kept.
+        """
+        pdf_data: dict[str, Optional[str]] = {}
+        for field_name, page_number, rect, checkbox in regions:
+            if page_number not in textpages:
+                page: fitz.Page = doc[page_number]
+                textpages[page_number] = (page, page.get_textpage())
+            page, textpage = textpages[page_number]
+            text: str = page.get_textbox(rect, textpage=textpage).strip()
+            if checkbox:
+                pdf_data[field_name] = "On" if text else "Off"
+            else:
+                pdf_data[field_name] = Formatter(text).value() if text else None
+        return pdf_data
+
+    def extract(self, doc: fitz.Document) -> dict[str, Optional[str]]:
+        """
+        Reads a flattened PDF using the template whose regions contain the
+        most text. The result has the same keys as a widget extraction, so it
+        resolves to the same form layout. Returns {} if no template fits.
+        """
+        best_data: dict[str, Optional[str]] = {}
+        best_hits: int = 0
+        best_layout: Optional[str] = None
+        textpages: dict[int, tuple[fitz.Page, fitz.TextPage]] = {}
+        for layout_name, regions in self.compiled.items():
+            if self.templates[layout_name]["page_count"] != doc.page_count:
+                continue
+            pdf_data = self._read_regions(doc, regions, textpages)
+            hits: int = sum(1 for value in pdf_data.values() if value not in (None, "Off"))
+            if hits > best_hits:
+                best_data, best_hits, best_layout = pdf_data, hits, layout_name
+
+        if best_layout:
+            logger.warning(
+                f"No form fields found; read {best_hits} regions using the "
+                f"'{best_layout}' template. Please verify the extracted values."
+            )
+        return best_data
@@ -0,0 +1,134 @@
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from archive_catalog import ArchiveCatalog, parse_archive_name
+from constants import pathmanager
+from logger import Logger
+from rich.console import Console
+from rich.table import Table
+from utils import load_json_ledger
+from worker_service import WorkerClient
+
+console = Console()
+logger = Logger()
+
+# The justification column holds a store reference (or a word count in
+# older rows); the text itself is compared through justification_sha256.
+IGNORED_FIELDS: frozenset[str] = frozenset({"source_path", "justification"})
+
+
+def _replay_file(item: tuple[Path, str]) -> dict[str, object]:
+    """
+    Re-runs extraction and transform for one archived PDF without side effects.
+    `item` is (file path, archive name); they differ for content-addressed blobs.
+    """
+    from ind_processor import IndProcessor
+
+    pdf_path, archive_name = item
+    parsed = parse_archive_name(Path(archive_name))
+    if parsed is None:
+        return {"file": archive_name, "log_id": None, "record": None, "error": "Unrecognized archive name."}
+    log_id, date_received = parsed
+    try:
+        processor = IndProcessor(pdf_path, dry_run=True)
+        record = processor.preflight(log_id=log_id, date_received=date_received)
+        return {"file": archive_name, "log_id": log_id, "record": record, "error": None}
+    except Exception as e:
+        return {"file": archive_name, "log_id": log_id, "record": None, "error": str(e)}
+
+
+def diff_records(
+    old: dict[str, str | int | None], new: dict[str, str | int | None]
+) -> dict[str, list[str | int | None]]:
+    """Returns {field: [old, new]} for fields present in both records that differ."""
+    return {
+        key: [old[key], new[key]]
+        for key in old.keys() & new.keys()
+        if key not in IGNORED_FIELDS and old[key] != new[key]
+    }
+
+
+def run_replay(
+    archive_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    report_path: Optional[Path] = None,
+    use_service: bool = False,
+) -> list[dict[str, object]]:
+    """
+    Replays every archived PDF through the current extraction and transform
+    rules on a process pool, reusing each award's log ID, and diffs the
+    results against the ledger. Files are taken from the archive catalog
+    when it has entries instead of listing the archive folder. With
+    `use_service`, files go to a running `WorkerService` instead of a new
+    pool. Nothing is saved except the change report.
+    """
+    archive_dir = archive_dir if archive_dir else pathmanager.archive_path
+    report_path = report_path if report_path else pathmanager.replay_report_path
+    catalog: list[dict] = ArchiveCatalog().entries() if archive_dir == pathmanager.archive_path else []
+    if catalog:
+        items: list[tuple[Path, str]] = sorted(
+            (Path(entry["path"]), entry.get("name") or Path(entry["path"]).name) for entry in catalog
+        )
+    else:
+        items = sorted((p, p.name) for p in archive_dir.iterdir() if p.suffix.lower() == ".pdf")
+    ledger: dict[str, dict] = {str(row.get("log_id")): row for row in load_json_ledger()}
+
+    client = WorkerClient.connect() if use_service else None
+    if client is not None:
+        with closing(client):
+            results: list[dict[str, object]] = client.map("replay", items)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_replay_file, items, chunksize=8))
+
+    entries: list[dict[str, object]] = []
+    status_counts: Counter[str] = Counter()
+    field_counts: Counter[str] = Counter()
+    for result in results:
+        old: Optional[dict] = ledger.get(str(result["log_id"]))
+        if result["error"]:
+            status = "failed"
+            changes = {}
+        elif old is None:
+            status = "not_in_ledger"
+            changes = {}
+        else:
+            changes = diff_records(old, result["record"])
+            status = "changed" if changes else "unchanged"
+            field_counts.update(changes.keys())
+        status_counts[status] += 1
+        if status != "unchanged":
+            entries.append(
+                {
+                    "log_id": result["log_id"],
+                    "file": result["file"],
+                    "status": status,
+                    "error": result["error"],
+                    "changes": changes,
+                }
+            )
+
+    with open(report_path, "w", encoding="utf-8") as file:
+        for entry in entries:
+            file.write(json.dumps(entry) + "\n")
+
+    table = Table(title="Replay Summary")
+    table.add_column("Status")
+    table.add_column("Count", justify="right")
+    for status in ("unchanged", "changed", "failed", "not_in_ledger"):
+        table.add_row(status, str(status_counts[status]))
+    console.print(table)
+    if field_counts:
+        field_table = Table(title="Changed Fields")
+        field_table.add_column("Field")
+        field_table.add_column("Awards", justify="right")
+        for field_name, count in field_counts.most_common():
+            field_table.add_row(field_name, str(count))
+        console.print(field_table)
+    logger.info(f"Replay report saved to '{report_path.name}'")
+
+    return entries
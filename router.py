@@ -0,0 +1,175 @@
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import fitz
+from form_layouts import LayoutRegistry
+from formatting import Formatter
+from logger import Logger
+from region_extract import RegionTemplates
+
+logger = Logger()
+
+IND: str = "IND"
+GRP: str = "GRP"
+REJECT: str = "REJECT"
+
+# Indirect object reference, e.g. '12 0 R'.
+OBJECT_REF = re.compile(r"(\d+) \d+ R")
+
+
+@dataclass
+class RouteDecision:
+    route: str
+    reason: str
+    fields: dict[str, Optional[str]] = field(default_factory=dict)
+
+
+def _array_refs(doc: fitz.Document, xref: int, key: str) -> list[int]:
+    """
+    Returns the object numbers in the array stored under `key`, following
+    the key when it points at an indirect array object.
+    """
+    kind, value = doc.xref_get_key(xref, key)
+    if kind == "xref":
+        value = doc.xref_object(int(value.split()[0]), compressed=True)
+    elif kind != "array":
+        return []
+    return [int(x) for x in OBJECT_REF.findall(value)]
+
+
+def form_fields(doc: fitz.Document, names: bool = False) -> dict[str, Optional[str]]:
+    """
+    Reads the fully qualified form field names and values from the AcroForm
+    field tree without loading any pages. Only text values are kept unless
+    `names` is set, which also keeps name values such as checkbox and radio
+    button states.
+    """
+    values: dict[str, Optional[str]] = {}
+    stack: list[tuple[int, str]] = [
+        (xref, "") for xref in _array_refs(doc, doc.pdf_catalog(), "AcroForm/Fields")
+    ]
+    seen: set[int] = set()
+    while stack:
+        xref, prefix = stack.pop()
+        if xref in seen:
+            continue
+        seen.add(xref)
+        t_kind, partial_name = doc.xref_get_key(xref, "T")
+        full_name = prefix
+        if t_kind == "string":
+            full_name = f"{prefix}.{partial_name}" if prefix else partial_name
+        kid_xrefs: list[int] = _array_refs(doc, xref, "Kids")
+        if kid_xrefs:
+            stack.extend((kid_xref, full_name) for kid_xref in kid_xrefs)
+        elif full_name:
+            v_kind, value = doc.xref_get_key(xref, "V")
+            keep: bool = v_kind == "string" or (names and v_kind == "name")
+            values[Formatter(full_name).key()] = value if keep else None
+    return values
+
+
+class PdfRouter:
+    """
+    Routes inbox files to IND processing, GRP, or a reject bucket using only
+    the PDF header, xref, page count and form field names. Page content is
+    never parsed and the file name is not consulted. Decisions are cached
+    by path, size and modification time, and IND decisions keep the form
+    field values for the scheduler.
+    """
+
+    _instance: Optional["PdfRouter"] = None
+
+    def __init__(self):
+        self._cache: dict[tuple[str, int, int], RouteDecision] = {}
+
+    @classmethod
+    def get(cls) -> "PdfRouter":
+        if cls._instance is None:
+            cls._instance = PdfRouter()
+        return cls._instance
+
+    def classify(self, pdf_path: Path) -> RouteDecision:
+        stat = pdf_path.stat()
+        cache_key = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+        decision: Optional[RouteDecision] = self._cache.get(cache_key)
+        if decision is None:
+            decision = self._classify(pdf_path)
+            self._cache[cache_key] = decision
+        return decision
+
+    @staticmethod
+    def _classify(pdf_path: Path) -> RouteDecision:
+        try:
+            with open(pdf_path, "rb") as file:
+                if file.read(5) != b"%PDF-":
+                    return RouteDecision(REJECT, "Not a PDF file.")
+            with fitz.open(pdf_path) as doc:
+                if doc.needs_pass:
+                    return RouteDecision(REJECT, "PDF is password protected.")
+                page_count: int = doc.page_count
+                fields: dict[str, Optional[str]] = form_fields(doc)
+        except Exception as e:
+            return RouteDecision(REJECT, f"Unreadable PDF: {e}")
+
+        if page_count > 2:
+            return RouteDecision(GRP, f"{page_count} pages.")
+
+        if not fields:
+            if RegionTemplates.get().has_template(page_count):
+                return RouteDecision(IND, "Flattened form.")
+            return RouteDecision(REJECT, "No form fields and no region template.")
+
+        try:
+            layout = LayoutRegistry.get().resolve(set(fields), report=False)
+        except ValueError as e:
+            return RouteDecision(REJECT, str(e), fields)
+        return RouteDecision(IND, f"'{layout.name}' form layout.", fields)
+
+    def ind_pdfs(self, folder: Path, skipped: Optional[list[Path]] = None) -> list[Path]:
+        """
+        Returns the folder's PDFs routed to IND processing. Nothing is moved;
+        GRP and rejected paths are appended to `skipped` when given.
+        """
+        ind_paths: list[Path] = []
+        grp_count: int = 0
+        for pdf_path in sorted(folder.iterdir()):
+            if not pdf_path.is_file() or pdf_path.suffix.lower() != ".pdf":
+                continue
+            try:
+                decision = self.classify(pdf_path)
+            except FileNotFoundError:
+                continue
+            if decision.route == IND:
+                ind_paths.append(pdf_path)
+            elif decision.route == GRP:
+                grp_count += 1
+                if skipped is not None:
+                    skipped.append(pdf_path)
+            elif skipped is not None:
+                skipped.append(pdf_path)
+        if grp_count:
+            logger.info(f"Skipped {grp_count} GRP files.")
+        return ind_paths
+
+    def reject(self, pdf_path: Path) -> None:
+        """
+        Moves a file routed to the reject bucket to `<folder>/rejected/` and
+        reports an unknown form layout. Other files are left alone.
+        """
+        try:
+            decision = self.classify(pdf_path)
+        except FileNotFoundError:
+            return
+        if decision.route != REJECT:
+            return
+        logger.warning(f"Rejected '{pdf_path.name}': {decision.reason}")
+        if decision.fields:
+            LayoutRegistry.report_unknown(decision.fields)
+        reject_dir = pdf_path.parent / "rejected"
+        reject_dir.mkdir(exist_ok=True)
+        try:
+            pdf_path.rename(reject_dir / pdf_path.name)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from logger import console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    ProgressColumn,
+    TextColumn,
+    TimeRemainingColumn,
+)
+from rich.text import Text
+
+
+class RateColumn(ProgressColumn):
+    def render(self, task) -> Text:
+        elapsed: Optional[float] = task.elapsed
+        if not elapsed or not task.completed:
+            return Text("- files/s")
+        return Text(f"{task.completed / elapsed:.1f} files/s")
+
+
+class RunProgress:
+    """
+    Single live progress bar for a processing run: files done, files/sec,
+    ETA, failures and skipped inbox files. Log lines printed while it runs
+    appear above the bar. Only one run progress is active at a time;
+    `advance`, `skip` and `paused` below are no-ops without one.
+    """
+
+    _current: Optional["RunProgress"] = None
+
+    def __init__(self, total: Optional[int] = None, description: str = "Processing"):
+        self.progress = Progress(
+            TextColumn("[bold]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            RateColumn(),
+            TimeRemainingColumn(),
+            TextColumn("[red1]failed {task.fields[failed]}[/red1]"),
+            TextColumn("[orange1]skipped {task.fields[skipped]}[/orange1]"),
+            console=console,
+        )
+        self.task_id = self.progress.add_task(description, total=total, failed=0, skipped=0)
+        self.failed: int = 0
+        self.skipped: int = 0
+        self._skipped_paths: set[str] = set()
+
+    def __enter__(self) -> "RunProgress":
+        self.progress.start()
+        RunProgress._current = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        RunProgress._current = None
+        self.progress.stop()
+
+    def set_total(self, total: int) -> None:
+        self.progress.update(self.task_id, total=total)
+
+    def advance(self, failed: bool = False) -> None:
+        self.failed += 1 if failed else 0
+        self.progress.update(self.task_id, advance=1, failed=self.failed)
+
+    def skip(self, path) -> None:
+        """Counts a skipped inbox file once, however often the inbox is listed."""
+        if str(path) in self._skipped_paths:
+            return
+        self._skipped_paths.add(str(path))
+        self.skipped += 1
+        self.progress.update(self.task_id, skipped=self.skipped)
+
+
+def set_total(total: int) -> None:
+    if RunProgress._current:
+        RunProgress._current.set_total(total)
+
+
+def advance(failed: bool = False) -> None:
+    if RunProgress._current:
+        RunProgress._current.advance(failed)
+
+
+def skip(path) -> None:
+    if RunProgress._current:
+        RunProgress._current.skip(path)
+
+
+@contextmanager
+def paused() -> Iterator[None]:
+    """Hides the live bar while the user answers a prompt."""
+    current: Optional[RunProgress] = RunProgress._current
+    if current:
+        current.progress.stop()
+    try:
+        yield
+    finally:
+        if current:
+            current.progress.start()
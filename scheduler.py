@@ -0,0 +1,176 @@
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from form_layouts import LayoutRegistry
+from formatting import Formatter
+from logger import Logger
+from router import PdfRouter
+from utils import find_organization
+
+logger = Logger()
+
+PRIORITY_KEYS: tuple[str, ...] = ("type", "received", "funding_org", "size")
+TYPE_RANK: dict[str, int] = {"OTS": 0, "SAS": 1}
+ORG_FIELDS: tuple[str, ...] = (
+    "employee_org",
+    "employee_supervisor_org",
+    "nominator_org",
+    "certifier_org",
+    "approver_org",
+)
+AMOUNT_FIELDS: tuple[str, ...] = (
+    "sas_monetary_amount",
+    "sas_time_off_amount",
+    "ots_monetary_amount",
+    "ots_time_off_amount",
+)
+
+
+@dataclass
+class WorkItem:
+    path: Path
+    award_type: str
+    funding_org: str
+    received: float
+    size: int
+
+    def sort_value(self, key: str):
+        if key == "type":
+            return TYPE_RANK.get(self.award_type, len(TYPE_RANK))
+        if key == "received":
+            return self.received
+        if key == "funding_org":
+            return self.funding_org
+        return self.size
+
+
+@dataclass
+class SchedulerConfig:
+    """
+    * priority: keys from `PRIORITY_KEYS`, most significant first. The first
+      key splits the queue into classes, e.g. OTS ahead of SAS by default.
+    * fair: round-robin across funding orgs within each class, so one org's
+      pile cannot hold back the others.
+    * org_limit: maximum awards per funding org in flight at once.
+    """
+
+    priority: tuple[str, ...] = ("type", "received")
+    fair: bool = True
+    org_limit: Optional[int] = None
+
+    def __post_init__(self):
+        unknown = [key for key in self.priority if key not in PRIORITY_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown priority keys {unknown}. Choose from {PRIORITY_KEYS}.")
+        if self.org_limit is not None and self.org_limit < 1:
+            raise ValueError("The per-org in-flight limit must be at least 1.")
+
+
+class AwardScheduler:
+    """
+    Orders inbox PDFs for processing. Award type and funding org are
+    estimated from the form field values the router already read, so
+    scheduling opens no PDF a second time. Work items are cached by path,
+    size and modification time.
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        self.config = config if config else SchedulerConfig()
+        self.in_flight: Counter[str] = Counter()
+        self._started: dict[str, str] = {}
+        self._items: dict[tuple[str, int, int], WorkItem] = {}
+
+    def probe(self, pdf_path: Path) -> WorkItem:
+        stat = pdf_path.stat()
+        cache_key = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+        item: Optional[WorkItem] = self._items.get(cache_key)
+        if item is None:
+            item = self._probe(pdf_path, stat)
+            self._items[cache_key] = item
+        return item
+
+    @staticmethod
+    def _probe(pdf_path: Path, stat) -> WorkItem:
+        fields: dict[str, Optional[str]] = PdfRouter.get().classify(pdf_path).fields
+        estimates: dict[str, object] = {}
+        if fields:
+            layout = LayoutRegistry.get().resolve(set(fields), report=False)
+            for attribute, pdf_field, formatter in layout.plan:
+                if attribute in ORG_FIELDS or attribute in AMOUNT_FIELDS:
+                    try:
+                        estimates[attribute] = formatter(Formatter(fields.get(pdf_field)).value())
+                    except ValueError:
+                        estimates[attribute] = None
+            estimates.update(layout.constants)
+
+        award_type: str = "-"
+        if estimates.get("sas_monetary_amount") or estimates.get("sas_time_off_amount"):
+            award_type = "SAS"
+        elif estimates.get("ots_monetary_amount") or estimates.get("ots_time_off_amount"):
+            award_type = "OTS"
+
+        funding_org: Optional[str] = estimates.get("funding_org")
+        if not funding_org:
+            org_matches: list[str] = [
+                org for org, _ in (find_organization(estimates.get(attr)) for attr in ORG_FIELDS) if org
+            ]
+            funding_org = Counter(org_matches).most_common(1)[0][0] if org_matches else None
+        return WorkItem(pdf_path, award_type, funding_org or "-", stat.st_mtime, stat.st_size)
+
+    def order(self, pdf_paths: Iterable[Path]) -> list[WorkItem]:
+        """
+        Returns the files as work items in processing order. A file that
+        cannot be probed is logged and kept, ranked by its received time as
+        an unknown type and org; files that no longer exist are dropped.
+        """
+        items: list[WorkItem] = []
+        for pdf_path in pdf_paths:
+            try:
+                items.append(self.probe(pdf_path))
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"Unable to probe '{pdf_path.name}' for scheduling: {e}")
+                try:
+                    stat = pdf_path.stat()
+                except FileNotFoundError:
+                    continue
+                items.append(WorkItem(pdf_path, "-", "-", stat.st_mtime, stat.st_size))
+        keys: tuple[str, ...] = self.config.priority
+        items.sort(key=lambda item: tuple(item.sort_value(key) for key in keys))
+        if not self.config.fair or not keys:
+            return items
+
+        turns: Counter[tuple] = Counter()
+        ranked: list[tuple[object, int, int, WorkItem]] = []
+        for position, item in enumerate(items):
+            item_class = item.sort_value(keys[0])
+            turn: int = turns[(item_class, item.funding_org)]
+            turns[(item_class, item.funding_org)] += 1
+            ranked.append((item_class, turn, position, item))
+        ranked.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in ranked]
+
+    def ready(
+        self, items: list[WorkItem], in_flight: Optional[Counter[str]] = None
+    ) -> Optional[WorkItem]:
+        """
+        Returns the first item whose funding org is under the in-flight limit.
+        `in_flight` defaults to the awards started through this scheduler.
+        """
+        in_flight = in_flight if in_flight is not None else self.in_flight
+        for item in items:
+            if self.config.org_limit is None or in_flight[item.funding_org] < self.config.org_limit:
+                return item
+        return None
+
+    def start(self, item: WorkItem) -> None:
+        self.in_flight[item.funding_org] += 1
+        self._started[str(item.path)] = item.funding_org
+
+    def finish(self, pdf_path: Path) -> None:
+        funding_org: Optional[str] = self._started.pop(str(pdf_path), None)
+        if funding_org is not None:
+            self.in_flight[funding_org] -= 1
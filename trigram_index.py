@@ -0,0 +1,57 @@
+from collections import Counter, defaultdict
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def trigrams(text: str) -> set[str]:
+    """Returns the set of character trigrams for a padded string."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex(Generic[T]):
+    """
+    Inverted index from character trigrams to candidate entries.
+    A lookup only scores the candidates that share at least one trigram
+    with the query, so the cost does not grow with the size of the map.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._sizes: list[int] = []
+        self._values: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, text: str, value: T) -> None:
+        if not text:
+            return
+        grams = trigrams(text)
+        idx = len(self._values)
+        self._values.append(value)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(idx)
+
+    def best_match(self, text: str) -> Optional[tuple[T, float]]:
+        """
+        Returns the best matching value and its Dice score (0.0 - 1.0),
+        or `None` when no candidate shares a trigram with the query.
+        """
+        if not text:
+            return None
+        query = trigrams(text)
+        shared: Counter[int] = Counter()
+        for gram in query:
+            shared.update(self._postings.get(gram, ()))
+        if not shared:
+            return None
+
+        best_idx, best_score = -1, 0.0
+        for idx, count in shared.items():
+            score = 2 * count / (len(query) + self._sizes[idx])
+            if score > best_score:
+                best_idx, best_score = idx, score
+        return self._values[best_idx], best_score
@@ -1,15 +1,68 @@
 import json
+import re
+from pathlib import Path
+from typing import Optional
 from uuid import uuid4
 
 import yaml
 from constants import (
     active_fiscal_year,
-    division_map,
-    mb_map,
+    fuzzy_min_confidence,
+    fuzzy_review_confidence,
     path_manager,
+    reference_data,
     testing_mode,
 )
 from formatting import Formatter
+from logger import Logger
+
+logger = Logger()
+
+
+def load_json_ledger(path: Optional[Path] = None) -> list[dict[str, str | int | None]]:
+    """
+    Loads the JSON ledger, treating an empty file as an empty list.
+    """
+    path = path if path else path_manager.json_output_path
+    with open(path, "r", encoding="utf-8") as file:
+        content: str = file.read().strip()
+        content = "[]" if not content else content
+        return json.loads(content)
+
+
+# Start of a TSV row: a log ID ('25-IND-001') or a test UUID, then a tab.
+# Rows saved before justifications moved to the side store can span
+# several lines when the justification held line breaks.
+TSV_ROW_START = re.compile(r"^(\d{2}-[A-Z]+-\d+|[0-9a-f-]{36})\t")
+
+
+def stream_tsv_rows(path: Path):
+    """
+    Yields (line number, log_id, columns, line count) for each TSV row.
+    Lines that do not start a row continue the previous one. Lines before
+    the first row are yielded with a log_id of None.
+    """
+    if not path.exists():
+        return
+    start_line: int = 0
+    lines: list[str] = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line_no, line in enumerate(file, start=1):
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            if TSV_ROW_START.match(line):
+                if lines:
+                    columns: list[str] = "\n".join(lines).split("\t")
+                    yield start_line, columns[0], columns, len(lines)
+                start_line, lines = line_no, [line]
+            elif lines:
+                lines.append(line)
+            else:
+                yield line_no, None, [line], 1
+    if lines:
+        columns = "\n".join(lines).split("\t")
+        yield start_line, columns[0], columns, len(lines)
 
 
 class LogID:
@@ -37,9 +90,10 @@ class LogID:
         except Exception as e:
             raise ValueError(f"Unable to load Log ID data. {e}")
 
-    def get(self) -> int:
+    def get(self, offset: int = 0) -> int:
         """
         Retrieves the log ID from the JSON file formatted as {fiscal_year}-{category}-{serial_number}.
+        `offset` reserves the n-th next serial for awards committed as a group.
         """
         if testing_mode:
             return str(uuid4())
@@ -53,7 +107,7 @@ class LogID:
             )
 
         fy_str = str(active_fiscal_year)[-2:]
-        log_serial = str(log_id_data[self.category]).zfill(3)
+        log_serial = str(log_id_data[self.category] + offset).zfill(3)
         log_id = f"{fy_str}-{self.category}-{log_serial}"
         self.validate(log_id)
         return log_id
@@ -68,6 +122,23 @@ class LogID:
         with open(path_manager.serial_path, "w") as file:
             yaml.safe_dump(log_id_data, file, indent=4, sort_keys=False)
 
+    def advance_past(self, log_id: str) -> None:
+        """
+        Sets the serial to one past the serial in `log_id` unless it is
+        already further along, so repeating the call is harmless.
+        """
+        if testing_mode:
+            return
+
+        serial = int(str(log_id).split("-")[-1])
+        log_id_data = self._load()
+        if log_id_data[self.category] > serial:
+            return
+        log_id_data[self.category] = serial + 1
+
+        with open(path_manager.serial_path, "w") as file:
+            yaml.safe_dump(log_id_data, file, indent=4, sort_keys=False)
+
     def validate(log_id: str) -> None:
         with open(path_manager.json_output_path, "r", encoding="utf-8") as file:
             content: str = file.read().strip()
@@ -87,6 +158,23 @@ class LogID:
             )
 
 
+def _accept_fuzzy_match(input_org: str, matched: str, score: float) -> bool:
+    """
+    Applies the confidence threshold to a fuzzy match and logs low-confidence
+    picks for review.
+    """
+    if score < fuzzy_min_confidence:
+        return False
+    if score < fuzzy_review_confidence:
+        logger.warning(
+            f"Low-confidence org match ({score:.2f}), please review: "
+            f"'{input_org}' -> '{matched}'"
+        )
+    else:
+        logger.info(f"Fuzzy org match ({score:.2f}): '{input_org}' -> '{matched}'")
+    return True
+
+
 def find_organization(input_org: str) -> tuple[str, str]:
     """
     Finds the organization matching the input string.
@@ -98,19 +186,11 @@ def find_organization(input_org: str) -> tuple[str, str]:
 
     org_match: str = ""
     div_match: str = ""
-    for target_org, div_list in division_map.items():
-        formatted_org = Formatter(target_org).standardized_org_div()
-        formatted_org = (
-            formatted_org.split("(")[0] if "(" in formatted_org else formatted_org
-        )
-        div_list = list(reversed(div_list))
-
+    for target_org, formatted_org, divisions in reference_data.org_index:
         if formatted_org in formatted_input:
             org_match = target_org
 
-        for target_div in div_list:
-            formatted_div = Formatter(target_div).standardized_org_div()
-
+        for target_div, formatted_div in divisions:
             if formatted_div in formatted_input or formatted_input in formatted_div:
                 org_match = target_org
                 div_match = target_div
@@ -118,6 +198,13 @@ def find_organization(input_org: str) -> tuple[str, str]:
         if org_match and div_match:
             break
 
+    if not org_match:
+        result = reference_data.org_trigrams.best_match(formatted_input)
+        if result is not None:
+            (target_org, target_div), score = result
+            if _accept_fuzzy_match(input_org, target_div or target_org, score):
+                org_match, div_match = target_org, target_div
+
     div_match = div_match if div_match else input_org
 
     return org_match, div_match
@@ -129,20 +216,59 @@ def find_mgmt_division(input_org: str) -> str:
 
     formatted_input = Formatter(input_org).standardized_org_div()
 
-    for org, div_list in mb_map.items():
-        formatted_org = Formatter(org).standardized_org_div()
-
+    for org, formatted_org, formatted_divs in reference_data.mb_index:
         if formatted_org in formatted_input:
             return org
 
-        for div in div_list:
-            formatted_div = Formatter(div).standardized_org_div()
-
+        for formatted_div in formatted_divs:
             if formatted_div in formatted_input:
                 return org
+
+    result = reference_data.mb_trigrams.best_match(formatted_input)
+    if result is not None:
+        org, score = result
+        if _accept_fuzzy_match(input_org, org, score):
+            return org
     return None
 
 
+def fsync_file(path: Path) -> None:
+    """
+    Flushes a file's written data to disk. The file is opened for writing,
+    since Windows only flushes handles with write access.
+    """
+    import os
+
+    with open(path, "r+b") as file:
+        os.fsync(file.fileno())
+
+
+def list_ind_pdfs(folder: Path, skipped: Optional[list[Path]] = None) -> list[Path]:
+    """
+    Lists the IND award PDFs in a folder. Files are routed by their PDF
+    structure rather than their name. GRP and rejected files are left in
+    place and appended to `skipped` when given.
+    """
+    from router import PdfRouter
+
+    return PdfRouter.get().ind_pdfs(folder, skipped)
+
+
+def set_aside_skipped(skipped: list[Path]) -> None:
+    """
+    Counts skipped inbox files on the progress bar and moves rejected ones
+    to `<folder>/rejected/`. Only the processing modes call this, so a dry
+    run or scheduling pass never moves files.
+    """
+    import run_progress
+    from router import PdfRouter
+
+    router = PdfRouter.get()
+    for skipped_path in skipped:
+        run_progress.skip(skipped_path)
+        router.reject(skipped_path)
+
+
 def update_serial_numbers():
     import warnings
     from time import sleep
@@ -184,15 +310,77 @@ def update_serial_numbers():
 
 
 class ManualEntry:
+    @staticmethod
+    def _normalize(data: dict) -> dict[str, str]:
+        return {k: Formatter(str(v)).value() for k, v in data.items()}
+
     @staticmethod
     def load() -> dict[str, str]:
         with open(path_manager.manual_entry_path, "r") as file:
             try:
                 data: dict = yaml.safe_load(file)
-                return {k: Formatter(str(v)).value() for k, v in data.items()}
+                return ManualEntry._normalize(data)
             except Exception as e:
                 print(e)
 
+    @staticmethod
+    def _iter_raw(path: Path):
+        """
+        Yields raw records from a CSV file (one row per award) or a YAML file
+        holding one mapping, a list of mappings, or several documents.
+        """
+        import csv
+
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            if path.suffix.lower() == ".csv":
+                yield from csv.DictReader(file)
+                return
+            for document in yaml.safe_load_all(file):
+                if isinstance(document, list):
+                    yield from document
+                elif isinstance(document, dict):
+                    yield document
+
+    @staticmethod
+    def iter_records(path: Optional[Path] = None):
+        """Streams the normalized records of a manual entry file one at a time."""
+        path = path if path else path_manager.manual_entry_path
+        for data in ManualEntry._iter_raw(path):
+            yield ManualEntry._normalize(data)
+
+    @staticmethod
+    def remove_records(indices: set[int], path: Optional[Path] = None) -> None:
+        """
+        Rewrites the manual entry file without the records at `indices`.
+        The new file is written beside the old one and moved into place, so
+        a crash leaves one or the other. A single-record file that was fully
+        committed is reset instead.
+        """
+        import csv
+        import os
+
+        path = path if path else path_manager.manual_entry_path
+        if not indices:
+            return
+        records: list[dict] = list(ManualEntry._iter_raw(path))
+        remaining: list[dict] = [r for idx, r in enumerate(records) if idx not in indices]
+
+        temp_path: Path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        if path.suffix.lower() == ".csv":
+            fieldnames: list[str] = list(records[0].keys())
+            with open(temp_path, "w", encoding="utf-8", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(remaining)
+        elif len(records) == 1 and path == path_manager.manual_entry_path:
+            ManualEntry.reset()
+            return
+        else:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                yaml.safe_dump_all(remaining, file, sort_keys=False)
+        os.replace(temp_path, path)
+        print(f"{path.name}: removed {len(indices)} committed records, {len(remaining)} remaining.")
+
     @staticmethod
     def reset():
         try:
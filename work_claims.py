@@ -0,0 +1,410 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import run_progress
+from logger import Logger
+from utils import list_ind_pdfs, set_aside_skipped
+
+logger = Logger()
+
+
+class WorkClaimer:
+    """
+    Lease-based claiming of inbox PDFs for several worker processes on one
+    host.
+    * A file is claimed by an atomic rename into `claims/<worker_id>/`, so
+      exactly one worker wins each file.
+    * Each worker touches `claims/<worker_id>.heartbeat` while it runs.
+      Files held by a worker whose heartbeat is older than the lease are
+      renamed back into the inbox for others to pick up.
+    * Files that fail processing are moved to `claims/failed/`, including a
+      file renamed for the archive when only the archive step failed.
+    The claims directory must be on the same filesystem as the inbox.
+
+    The serial file, ledger, TSV output and commit journal live in the
+    local data folder, so workers on different hosts would allocate the
+    same log IDs. `start` refuses to run while a worker from another host
+    holds a live heartbeat.
+    """
+
+    def __init__(
+        self,
+        inbox: Path,
+        claims_dir: Optional[Path] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 300.0,
+        scheduler=None,
+    ):
+        self.inbox = inbox
+        self.claims_dir = claims_dir if claims_dir else inbox / ".claims"
+        self.worker_id = worker_id if worker_id else f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.scheduler = scheduler
+        self.worker_dir = self.claims_dir / self.worker_id
+        self.heartbeat_path = self.claims_dir / f"{self.worker_id}.heartbeat"
+        self.failed_dir = self.claims_dir / "failed"
+        self.lock_path = self.claims_dir / "commit.lock"
+        self.hostname: str = socket.gethostname()
+        self._stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._lock_token: Optional[str] = None
+        self.remaining: int = 0
+
+        self.worker_dir.mkdir(parents=True, exist_ok=True)
+        self.failed_dir.mkdir(parents=True, exist_ok=True)
+
+    def heartbeat(self) -> None:
+        """Refreshes this worker's heartbeat and the commit lock while it is held."""
+        self.heartbeat_path.write_text(self.hostname, encoding="utf-8")
+        token: Optional[str] = self._lock_token
+        if token is not None and self._lock_owner() == token:
+            try:
+                os.utime(self.lock_path)
+            except FileNotFoundError:
+                pass
+
+    def _check_single_host(self) -> None:
+        now = time.time()
+        for heartbeat_path in self.claims_dir.glob("*.heartbeat"):
+            try:
+                if now - heartbeat_path.stat().st_mtime >= self.lease_seconds:
+                    continue
+                host: str = heartbeat_path.read_text(encoding="utf-8").strip()
+            except FileNotFoundError:
+                continue
+            if host and host != self.hostname:
+                raise ValueError(
+                    f"Worker '{heartbeat_path.stem}' on host '{host}' is claiming from this inbox. "
+                    "Claim mode shares log IDs through local files and only supports one host."
+                )
+
+    def start(self) -> None:
+        """Starts the heartbeat thread."""
+        self._check_single_host()
+        self.heartbeat()
+
+        def beat() -> None:
+            while not self._stop.wait(self.lease_seconds / 3):
+                self.heartbeat()
+
+        self._heartbeat_thread = threading.Thread(target=beat, daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop(self) -> None:
+        """Stops the heartbeat and returns any unprocessed claims to the inbox."""
+        self._stop.set()
+        if self._heartbeat_thread:
+            self._heartbeat_thread.join()
+        self._release_all(self.worker_dir)
+        self.heartbeat_path.unlink(missing_ok=True)
+
+    def _claimed_by_org(self) -> Counter:
+        """Counts the files currently claimed by all workers per funding org."""
+        in_flight: Counter = Counter()
+        for worker_dir in self.claims_dir.iterdir():
+            if not worker_dir.is_dir() or worker_dir == self.failed_dir:
+                continue
+            for claimed_path in worker_dir.iterdir():
+                try:
+                    in_flight[self.scheduler.probe(claimed_path).funding_org] += 1
+                except (FileNotFoundError, ValueError):
+                    continue
+        return in_flight
+
+    def _candidates(self) -> list[Path]:
+        """
+        Inbox PDFs in claim order. With a scheduler, files are in priority
+        order and orgs at their in-flight limit across all workers are skipped.
+        """
+        skipped: list[Path] = []
+        pdf_paths: list[Path] = list_ind_pdfs(self.inbox, skipped)
+        set_aside_skipped(skipped)
+        if self.scheduler is None:
+            return pdf_paths
+        pending = self.scheduler.order(pdf_paths)
+        if self.scheduler.config.org_limit is None:
+            return [item.path for item in pending]
+        in_flight: Counter = self._claimed_by_org()
+        return [
+            item.path
+            for item in pending
+            if in_flight[item.funding_org] < self.scheduler.config.org_limit
+        ]
+
+    def claim_next(self) -> Optional[Path]:
+        """
+        Claims the next available inbox PDF, or returns None if none remain.
+        `remaining` is set to the number of candidates left after the claim.
+        """
+        candidates: list[Path] = self._candidates()
+        for position, pdf_path in enumerate(candidates):
+            claimed_path = self.worker_dir / pdf_path.name
+            try:
+                pdf_path.rename(claimed_path)
+            except (FileNotFoundError, FileExistsError, PermissionError):
+                continue
+            self.remaining = len(candidates) - position - 1
+            return claimed_path
+        self.remaining = 0
+        return None
+
+    def fail(self, claimed_path: Path) -> None:
+        """
+        Parks a claimed file that failed processing. Only one file is claimed
+        at a time, so anything left in the worker's folder is that file,
+        possibly already renamed to its log ID when archiving failed after
+        the award was saved. Either way it must not go back to the inbox.
+        """
+        for leftover_path in self.worker_dir.iterdir():
+            if leftover_path != claimed_path:
+                logger.warning(
+                    f"'{leftover_path.name}' was saved but not archived; moved it to "
+                    f"'{self.failed_dir.name}' to archive by hand."
+                )
+            leftover_path.rename(self.failed_dir / leftover_path.name)
+
+    def _release_all(self, worker_dir: Path) -> int:
+        released = 0
+        if not worker_dir.exists():
+            return released
+        for claimed_path in worker_dir.iterdir():
+            try:
+                claimed_path.rename(self.inbox / claimed_path.name)
+                released += 1
+            except (FileNotFoundError, FileExistsError):
+                continue
+        return released
+
+    def reclaim_expired(self) -> int:
+        """
+        Returns files held by workers with expired heartbeats to the inbox,
+        after rolling forward any commit they left unfinished. Returns the
+        number of files released.
+        """
+        released = 0
+        now = time.time()
+        for worker_dir in self.claims_dir.iterdir():
+            if not worker_dir.is_dir() or worker_dir in (self.worker_dir, self.failed_dir):
+                continue
+            heartbeat_path = self.claims_dir / f"{worker_dir.name}.heartbeat"
+            try:
+                last_beat = heartbeat_path.stat().st_mtime
+            except FileNotFoundError:
+                last_beat = 0.0
+            if now - last_beat < self.lease_seconds:
+                continue
+            if any(worker_dir.iterdir()):
+                # Finish the expired worker's commit first, so a file it
+                # renamed to its log ID is archived, not processed again.
+                from ind_processor import recover_incomplete_commits
+
+                with self.commit_lock():
+                    recovered: list[str] = recover_incomplete_commits()
+                if recovered:
+                    logger.warning(f"Recovered interrupted commits: {recovered}")
+            count = self._release_all(worker_dir)
+            if count:
+                logger.warning(f"Reclaimed {count} files from expired worker '{worker_dir.name}'")
+            released += count
+            try:
+                worker_dir.rmdir()
+                heartbeat_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        return released
+
+    def _lock_owner(self) -> Optional[str]:
+        try:
+            return self.lock_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _break_stale_lock(self) -> None:
+        """
+        Removes a lock file older than the lease. The file is first renamed to
+        a unique name, so when several workers find the same stale lock only
+        one removes it.
+        """
+        try:
+            if time.time() - self.lock_path.stat().st_mtime <= self.lease_seconds:
+                return
+            stale_path = self.lock_path.with_suffix(f".{uuid.uuid4().hex}.stale")
+            self.lock_path.rename(stale_path)
+        except FileNotFoundError:
+            return
+        holder: str = stale_path.read_text(encoding="utf-8")
+        stale_path.unlink(missing_ok=True)
+        logger.warning(f"Removed abandoned commit lock held by '{holder}'.")
+
+    @contextmanager
+    def commit_lock(self, poll_seconds: float = 0.1) -> Iterator[None]:
+        """
+        Cross-process lock around log ID allocation and the commit writes.
+        The lock file holds a token unique to this acquisition and is touched
+        by the heartbeat while held. A lock file older than the lease is
+        treated as abandoned, and only the holder's token removes the lock.
+        """
+        token: str = f"{self.worker_id} {uuid.uuid4().hex}"
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                self._break_stale_lock()
+                time.sleep(poll_seconds)
+        try:
+            os.write(fd, token.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self._lock_token = token
+        try:
+            yield
+        finally:
+            self._lock_token = None
+            if self._lock_owner() == token:
+                self.lock_path.unlink(missing_ok=True)
+            else:
+                logger.warning("The commit lock was taken over while held; leaving it in place.")
+
+
+class LockedCommitter:
+    """
+    Committer for `IndProcessor.process_pdf_data` that allocates the log ID
+    and saves the award while holding the cross-process commit lock. Every
+    commit first rolls forward any commit a crashed or failed worker left in
+    the journal, since nothing else commits while the lock is held, then
+    re-checks duplicates and caps against the other workers' commits.
+    """
+
+    def __init__(self, claimer: WorkClaimer):
+        self.claimer = claimer
+
+    def add(self, processor) -> None:
+        from ind_processor import recover_incomplete_commits
+
+        with self.claimer.commit_lock():
+            recovered: list[str] = recover_incomplete_commits()
+            if recovered:
+                logger.warning(f"Recovered interrupted commits: {recovered}")
+            # Other workers may have committed since this award was validated.
+            processor._check_duplicate()
+            processor._validate_fiscal_year_caps()
+            processor.assign_log_id(processor.category)
+            processor._save_and_log()
+        logger.final(processor)
+
+
+def run_claim_worker(claimer: WorkClaimer) -> tuple[list[str], list[dict[str, str]]]:
+    """
+    Claims and processes inbox PDFs until none are left. Safe to run in
+    several processes on one host against the same inbox.
+    """
+    from ind_processor import IndProcessor
+
+    processed_list: list[str] = []
+    failed_list: list[dict[str, str]] = []
+    committer = LockedCommitter(claimer)
+
+    claimer.start()
+    try:
+        while True:
+            claimer.reclaim_expired()
+            claimed_path = claimer.claim_next()
+            if claimed_path is None:
+                break
+            run_progress.set_total(len(processed_list) + len(failed_list) + 1 + claimer.remaining)
+            processor: Optional[IndProcessor] = None
+            try:
+                processor = IndProcessor(claimed_path, defer_log_id=True)
+                processor.process_pdf_data(committer)
+                processed_list.append(claimed_path.name)
+                run_progress.advance()
+            except Exception as e:
+                logger.error(e)
+                claimer.fail(claimed_path)
+                failed_list.append(
+                    {
+                        "file": claimed_path.name,
+                        "error": str(e)[:100],
+                        **(processor.journal_ref() if processor else {}),
+                    }
+                )
+                run_progress.advance(failed=True)
+    finally:
+        claimer.stop()
+
+    return processed_list, failed_list
+
+
+class _CheckClaimer(WorkClaimer):
+    """Claimer over plain files, used by `check_claims` without routing PDFs."""
+
+    def _candidates(self) -> list[Path]:
+        return sorted(self.inbox.glob("*.pdf"))
+
+
+def _check_worker(inbox: str, lease_seconds: float) -> list[str]:
+    """Claims every file it can, bumping a shared counter under the commit lock."""
+    claimer = _CheckClaimer(Path(inbox), lease_seconds=lease_seconds)
+    counter_path: Path = claimer.claims_dir / "counter"
+    claimed: list[str] = []
+    claimer.start()
+    try:
+        while True:
+            claimed_path = claimer.claim_next()
+            if claimed_path is None:
+                break
+            with claimer.commit_lock(poll_seconds=0.005):
+                count: int = int(counter_path.read_text() or 0) if counter_path.exists() else 0
+                time.sleep(0.001)
+                counter_path.write_text(str(count + 1))
+            claimed.append(claimed_path.name)
+            claimed_path.unlink()
+    finally:
+        claimer.stop()
+    return claimed
+
+
+def check_claims(processes: int = 4, files: int = 200, lease_seconds: float = 30.0) -> bool:
+    """
+    Runs `processes` local claim workers against a scratch inbox of `files`
+    empty files and checks that every file was claimed exactly once and that
+    no two commit lock holders overlapped. Nothing outside the scratch
+    folder is touched.
+    """
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    with tempfile.TemporaryDirectory() as scratch:
+        inbox = Path(scratch)
+        for idx in range(files):
+            (inbox / f"{idx:05d}.pdf").touch()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            claimed: list[str] = [
+                name
+                for names in executor.map(
+                    _check_worker, [str(inbox)] * processes, [lease_seconds] * processes
+                )
+                for name in names
+            ]
+        counter_path: Path = inbox / ".claims" / "counter"
+        counter: int = int(counter_path.read_text()) if counter_path.exists() else 0
+
+    duplicates: list[str] = [name for name, count in Counter(claimed).items() if count > 1]
+    passed: bool = len(claimed) == files and not duplicates and counter == files
+    message: str = (
+        f"Claim check with {processes} processes: {len(claimed)}/{files} files claimed, "
+        f"{len(duplicates)} claimed twice, {counter} locked commits."
+    )
+    if passed:
+        logger.info(message)
+    else:
+        logger.error(message)
+    return passed
@@ -0,0 +1,232 @@
+import hashlib
+import importlib
+import os
+import secrets
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Callable, Optional
+
+from constants import pathmanager
+from logger import Logger
+
+logger = Logger()
+
+# Job name -> (module, function). Resolved inside the worker processes so
+# the client never imports fitz or the processor modules.
+JOBS: dict[str, tuple[str, str]] = {
+    "extract": ("worker_service", "_extract_job"),
+    "preflight": ("dry_run", "_preflight_file"),
+    "replay": ("replay", "_replay_file"),
+}
+
+
+def _address() -> str:
+    if sys.platform == "win32":
+        return r"\\.\pipe\ind_processor_workers"
+    return str(pathmanager.worker_socket_path)
+
+
+def _extract_job(pdf_bytes: bytes) -> dict[str, Optional[str]]:
+    from ind_processor import extract_pdf_fields
+
+    return extract_pdf_fields(pdf_bytes)
+
+
+def code_version() -> str:
+    """
+    Hashes the source of every module next to this one, so a client can
+    tell when a running service was started from different code.
+    """
+    digest = hashlib.sha256()
+    for source_path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        digest.update(source_path.name.encode("utf-8"))
+        digest.update(source_path.read_bytes())
+    return digest.hexdigest()
+
+
+_resolved: dict[str, Callable] = {}
+
+
+def _run_job(job: str, item):
+    func = _resolved.get(job)
+    if func is None:
+        module_name, func_name = JOBS[job]
+        func = getattr(importlib.import_module(module_name), func_name)
+        _resolved[job] = func
+    return func(item)
+
+
+def _warm_worker() -> None:
+    """Pays the import and cache costs once per worker process."""
+    from form_layouts import LayoutRegistry
+    from region_extract import RegionTemplates
+    from router import PdfRouter
+
+    for module_name in ["ind_processor", *(module_name for module_name, _ in JOBS.values())]:
+        importlib.import_module(module_name)
+    LayoutRegistry.get()
+    RegionTemplates.get()
+    PdfRouter.get()
+
+
+class WorkerService:
+    """
+    Long-lived pool of warm extraction/transform processes listening on a
+    local socket (a named pipe on Windows). Each request is a job name and a
+    list of items; the reply holds the results in the same order.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.version: str = code_version()
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    request: dict = conn.recv()
+                except (EOFError, OSError):
+                    return
+                job: str = request.get("job")
+                try:
+                    if job == "ping":
+                        conn.send({"results": [], "version": self.version})
+                        continue
+                    if job not in JOBS:
+                        raise ValueError(f"Unknown job '{job}'.")
+                    items: list = request.get("items") or []
+                    results = list(self.pool.map(partial(_run_job, job), items, chunksize=4))
+                    conn.send({"results": results})
+                except Exception as e:
+                    conn.send({"error": str(e)})
+
+    def serve(self) -> None:
+        address: str = _address()
+        if sys.platform != "win32" and os.path.exists(address):
+            try:
+                Client(address, authkey=pathmanager.worker_key_path.read_bytes()).close()
+            except Exception:
+                os.unlink(address)
+            else:
+                raise ValueError("A worker service is already running.")
+
+        # The key file is created owner-only, never readable even briefly.
+        authkey: bytes = secrets.token_bytes(32)
+        pathmanager.worker_key_path.unlink(missing_ok=True)
+        fd = os.open(pathmanager.worker_key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.write(fd, authkey)
+        finally:
+            os.close(fd)
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker) as pool:
+            self.pool = pool
+            with Listener(address, authkey=authkey) as listener:
+                logger.info(f"Worker service listening on '{address}'.")
+                try:
+                    while True:
+                        try:
+                            conn = listener.accept()
+                        except (OSError, EOFError, AuthenticationError) as e:
+                            logger.warning(f"Rejected a worker service connection: {e}")
+                            continue
+                        threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+                except KeyboardInterrupt:
+                    logger.info("Worker service stopped.")
+        pathmanager.worker_key_path.unlink(missing_ok=True)
+
+
+class WorkerClient:
+    """
+    Submits jobs to a running `WorkerService` over one connection. Jobs are
+    only sent to a service running the same code as the client.
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+
+    @classmethod
+    def connect(cls) -> Optional["WorkerClient"]:
+        """
+        Returns a client, or None when no service is running or the running
+        service was started from different code.
+        """
+        try:
+            authkey: bytes = pathmanager.worker_key_path.read_bytes()
+            client = cls(Client(_address(), authkey=authkey))
+        except Exception:
+            return None
+        try:
+            client.conn.send({"job": "ping"})
+            version: Optional[str] = client.conn.recv().get("version")
+        except (EOFError, OSError):
+            client.close()
+            return None
+        if version != code_version():
+            logger.warning("The worker service is running older code; restart it with --serve.")
+            client.close()
+            return None
+        return client
+
+    def map(self, job: str, items: list) -> list:
+        self.conn.send({"job": job, "items": list(items)})
+        response: dict = self.conn.recv()
+        if "error" in response:
+            raise ValueError(f"Worker service error: {response['error']}")
+        return response["results"]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ServiceExtractor:
+    """
+    Extracts PDF form fields on a running `WorkerService`, with one
+    connection per calling thread so concurrent readers do not share one.
+    `extract` returns None once no service with the same code is reachable,
+    and the caller extracts in-process instead.
+    """
+
+    def __init__(self):
+        self.available: bool = True
+        self._local = threading.local()
+        self._clients: list[WorkerClient] = []
+        self._lock = threading.Lock()
+
+    def _client(self) -> Optional[WorkerClient]:
+        if not self.available:
+            return None
+        client: Optional[WorkerClient] = getattr(self._local, "client", None)
+        if client is None:
+            client = WorkerClient.connect()
+            if client is None:
+                self.available = False
+                logger.warning("No worker service is running; extracting in-process.")
+                return None
+            self._local.client = client
+            with self._lock:
+                self._clients.append(client)
+        return client
+
+    def extract(self, pdf_bytes: bytes) -> Optional[dict[str, Optional[str]]]:
+        client: Optional[WorkerClient] = self._client()
+        if client is None:
+            return None
+        try:
+            return client.map("extract", [pdf_bytes])[0]
+        except (EOFError, OSError) as e:
+            self.available = False
+            logger.warning(f"Lost the worker service connection ({e}); extracting in-process.")
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients = []